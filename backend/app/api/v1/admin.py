@@ -60,6 +60,7 @@ def admin_create_user(
 
 
 @router.put("/users/{user_id}", response_model=schemas.User)
+@router.patch("/users/{user_id}", response_model=schemas.User)
 def admin_update_user(
     user_id: int,
     update: schemas.UserUpdate,
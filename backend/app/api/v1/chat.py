@@ -1,14 +1,17 @@
 """
 Chat session and message endpoints.
 """
-from typing import List
+from typing import Any, Dict, List, Optional
 import json
+import queue
+import threading
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
-from ...db.session import get_db
+from ...db.session import SessionLocal, get_db
 from ...api.deps import get_current_user
 from ...core.logging import get_logger
 from ... import models, schemas
@@ -123,6 +126,109 @@ async def get_chat_session(
     return session
 
 
+_MESSAGES_PAGE_MAX = 200
+
+
+@router.get("/sessions/{session_id}/messages", response_model=List[schemas.ChatMessage])
+async def get_chat_messages(
+    session_id: int,
+    limit: int = 50,
+    offset: int = 0,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    """
+    Get a page of a session's messages, oldest first.
+
+    Pages are counted back from the newest message: `offset` skips that many of the
+    latest messages, so a client holding the newest N messages asks for `offset=N`
+    to load the ones before them.
+    """
+    session = _get_owned_session(db, session_id, current_user)
+    limit = min(max(limit, 1), _MESSAGES_PAGE_MAX)
+    messages = db.query(models.ChatMessage).filter(
+        models.ChatMessage.session_id == session.id
+    ).order_by(models.ChatMessage.id.desc()).offset(max(offset, 0)).limit(limit).all()
+    messages.reverse()
+    return messages
+
+
+def _get_owned_session(db: Session, session_id: int, current_user: schemas.User) -> models.ChatSession:
+    session = db.query(models.ChatSession).filter(
+        models.ChatSession.id == session_id,
+        models.ChatSession.user_id == current_user.id
+    ).first()
+
+    if not session:
+        logger.warning(f"Chat session {session_id} not found or unauthorized | user: {current_user.email}")
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return session
+
+
+def _save_user_message(db: Session, session: models.ChatSession, message: str) -> None:
+    user_message = models.ChatMessage(
+        session_id=session.id,
+        role="user",
+        content=message
+    )
+    db.add(user_message)
+    db.commit()
+    db.refresh(user_message)
+
+    # Update session title on first message (if still default)
+    if (session.title or "").strip().lower() in ("", "new chat"):
+        session.title = _derive_session_title(message)
+        session.updated_at = func.now()
+        db.commit()
+
+
+def _save_assistant_message(db: Session, session: models.ChatSession, agent_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Persist the agent answer and return the ChatResponse payload."""
+    response_text = agent_result.get("answer", "No response generated.")
+    retrieved_chunks = []
+    # Provide small amount of metadata back to UI
+    if agent_result.get("agent_trace"):
+        retrieved_chunks.append("Agent trace: " + " -> ".join(agent_result["agent_trace"]))
+    if agent_result.get("web_findings"):
+        retrieved_chunks.append("Web findings included")
+
+    # Save assistant response
+    assistant_message = models.ChatMessage(
+        session_id=session.id,
+        role="assistant",
+        content=response_text,
+        message_metadata=json.dumps({
+            "agent_trace": agent_result.get("agent_trace", []),
+            "has_web_findings": bool(agent_result.get("web_findings")),
+            "success": True,
+            "pipeline": "multi_agent_chat_v1",
+            "persona_outputs": {
+                "sde": bool(agent_result.get("sde_answer")),
+                "pm": bool(agent_result.get("pm_answer")),
+            },
+        })
+    )
+    db.add(assistant_message)
+
+    # Update session timestamp
+    session.updated_at = func.now()
+
+    db.commit()
+    db.refresh(assistant_message)
+
+    logger.info(
+        f"Message sent and response generated | session: {session.id} | "
+        f"agents: {len(agent_result.get('agent_trace', []))} | "
+        f"web: {bool(agent_result.get('web_findings'))}"
+    )
+
+    return {
+        "session_id": session.id,
+        "message": assistant_message,
+        "retrieved_chunks": retrieved_chunks if retrieved_chunks else None
+    }
+
+
 @router.post("/sessions/{session_id}/messages", response_model=schemas.ChatResponse)
 async def send_chat_message(
     session_id: int,
@@ -136,31 +242,10 @@ async def send_chat_message(
     logger.info(f"Sending message to chat session {session_id} | user: {current_user.email}")
     
     # Verify session exists and user owns it
-    session = db.query(models.ChatSession).filter(
-        models.ChatSession.id == session_id,
-        models.ChatSession.user_id == current_user.id
-    ).first()
-    
-    if not session:
-        logger.warning(f"Chat session {session_id} not found or unauthorized | user: {current_user.email}")
-        raise HTTPException(status_code=404, detail="Chat session not found")
+    session = _get_owned_session(db, session_id, current_user)
     
     try:
-        # Save user message
-        user_message = models.ChatMessage(
-            session_id=session_id,
-            role="user",
-            content=request.message
-        )
-        db.add(user_message)
-        db.commit()
-        db.refresh(user_message)
-
-        # Update session title on first message (if still default)
-        if (session.title or "").strip().lower() in ("", "new chat"):
-            session.title = _derive_session_title(request.message)
-            session.updated_at = func.now()
-            db.commit()
+        _save_user_message(db, session, request.message)
         
         # Run multi-agent chat workflow (Milestone 4)
         logger.info(
@@ -175,49 +260,7 @@ async def send_chat_message(
             config_id=request.config_id,
         )
         
-        response_text = agent_result.get("answer", "No response generated.")
-        retrieved_chunks = []
-        # Provide small amount of metadata back to UI
-        if agent_result.get("agent_trace"):
-            retrieved_chunks.append("Agent trace: " + " -> ".join(agent_result["agent_trace"]))
-        if agent_result.get("web_findings"):
-            retrieved_chunks.append("Web findings included")
-        
-        # Save assistant response
-        assistant_message = models.ChatMessage(
-            session_id=session_id,
-            role="assistant",
-            content=response_text,
-            message_metadata=json.dumps({
-                "agent_trace": agent_result.get("agent_trace", []),
-                "has_web_findings": bool(agent_result.get("web_findings")),
-                "success": True,
-                "pipeline": "multi_agent_chat_v1",
-                "persona_outputs": {
-                    "sde": bool(agent_result.get("sde_answer")),
-                    "pm": bool(agent_result.get("pm_answer")),
-                },
-            })
-        )
-        db.add(assistant_message)
-        
-        # Update session timestamp
-        session.updated_at = func.now()
-        
-        db.commit()
-        db.refresh(assistant_message)
-        
-        logger.info(
-            f"Message sent and response generated | session: {session_id} | "
-            f"agents: {len(agent_result.get('agent_trace', []))} | "
-            f"web: {bool(agent_result.get('web_findings'))}"
-        )
-        
-        return {
-            "session_id": session_id,
-            "message": assistant_message,
-            "retrieved_chunks": retrieved_chunks if retrieved_chunks else None
-        }
+        return _save_assistant_message(db, session, agent_result)
     
     except Exception as e:
         db.rollback()
@@ -225,6 +268,79 @@ async def send_chat_message(
         raise HTTPException(status_code=500, detail=f"Failed to process message: {str(e)}")
 
 
+@router.post("/sessions/{session_id}/messages/stream")
+async def stream_chat_message(
+    session_id: int,
+    request: schemas.ChatRequest,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    """
+    Send a message and stream the answer as Server-Sent Events.
+
+    Frames are `data: {json}` with `type` one of:
+    - `token`: a fragment of the final answer as the LLM generates it
+    - `done`: the saved assistant message (same shape as the non-streaming response)
+    - `error`: processing failed; `detail` holds the reason
+    """
+    from ...services.multi_agent_chat import run_multi_agent_chat
+
+    logger.info(f"Streaming message to chat session {session_id} | user: {current_user.email}")
+
+    session = _get_owned_session(db, session_id, current_user)
+    try:
+        _save_user_message(db, session, request.message)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error saving chat message: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to process message: {str(e)}")
+
+    project_id = session.project_id
+    user_id = current_user.id
+    events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+
+    def run_agents() -> None:
+        # The workflow runs on its own thread and DB session: the request-scoped
+        # session may be closed before the response body finishes streaming.
+        worker_db = SessionLocal()
+        try:
+            agent_result = run_multi_agent_chat(
+                db=worker_db,
+                project_id=project_id,
+                user_id=user_id,
+                session_id=session_id,
+                question=request.message,
+                config_id=request.config_id,
+                on_token=lambda token: events.put({"type": "token", "content": token}),
+            )
+            worker_session = worker_db.get(models.ChatSession, session_id)
+            result = _save_assistant_message(worker_db, worker_session, agent_result)
+            result["message"] = schemas.ChatMessage.model_validate(result["message"]).model_dump(mode="json")
+            events.put({"type": "done", **result})
+        except Exception as e:
+            worker_db.rollback()
+            logger.error(f"Error processing streamed chat message: {e}", exc_info=True)
+            events.put({"type": "error", "detail": f"Failed to process message: {str(e)}"})
+        finally:
+            worker_db.close()
+            events.put(None)
+
+    threading.Thread(target=run_agents, name=f"chat-stream-{session_id}", daemon=True).start()
+
+    def sse_frames():
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            yield f"data: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        sse_frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/sessions/{session_id}")
 async def delete_chat_session(
     session_id: int,
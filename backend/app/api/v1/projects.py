@@ -3,6 +3,7 @@ Project management endpoints (CRUD, file uploads, analysis).
 """
 from typing import List, Optional
 from pathlib import Path
+import asyncio
 import json
 import shutil
 import zipfile
@@ -17,9 +18,10 @@ import urllib.parse
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import FileResponse
 
-from ...db.session import get_db
+from ...db.session import SessionLocal, get_db
 from ...api.deps import get_current_user
 from ...core.config import settings
 from ...core.logging import get_logger
@@ -29,6 +31,10 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Long-poll limits for GET /{project_id}/progress (seconds).
+_PROGRESS_MAX_WAIT = 25.0
+_PROGRESS_WAIT_INTERVAL = 0.5
+
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB
 MAX_GITHUB_REPO_SIZE_MB = 100
 TEMP_UPLOAD_DIR = Path(settings.PROJECT_FILES_DIR).parent / "temp"
@@ -517,35 +523,18 @@ async def get_project_analysis(
         raise HTTPException(status_code=500, detail="Failed to retrieve analysis")
 
 
-@router.get("/{project_id}/progress")
-async def get_project_progress(
-    project_id: int,
-    since_id: int = 0,
-    db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(get_current_user)
-):
-    """Get latest progress updates for a project (polling endpoint)"""
-    logger.debug(f"Fetching progress for project {project_id} since ID {since_id} | user: {current_user.email}")
-    
-    # Verify project ownership
-    db_project = db.query(models.Project).filter(
-        models.Project.id == project_id,
-        models.Project.owner_id == current_user.id
-    ).first()
+def _read_progress(project_id: int, since_id: int):
+    """Progress records after `since_id` (serialized) and the project's current status."""
+    from ...models.project import ProjectProgress
     
-    if not db_project:
-        logger.warning(f"Project {project_id} not found or unauthorized | user: {current_user.email}")
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    try:
-        from ...models.project import ProjectProgress
-        
-        # Get progress records after since_id
+    with SessionLocal() as db:
         progress_records = db.query(ProjectProgress).filter(
             ProjectProgress.project_id == project_id,
             ProjectProgress.id > since_id
         ).order_by(ProjectProgress.id).limit(50).all()
-        
+        status = db.query(models.Project.preprocessing_status).filter(
+            models.Project.id == project_id
+        ).scalar()
         progress_data = [
             {
                 'id': p.id,
@@ -560,11 +549,55 @@ async def get_project_progress(
             }
             for p in progress_records
         ]
+    return progress_data, status
+
+
+@router.get("/{project_id}/progress")
+async def get_project_progress(
+    project_id: int,
+    since_id: int = 0,
+    wait: float = 0.0,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    """
+    Get latest progress updates for a project (polling endpoint).
+
+    With `wait` > 0 the request is held (long-poll, capped at 25s) until updates
+    newer than `since_id` exist, the project leaves the processing state, or the
+    wait elapses, so clients need one request per batch of updates.
+    """
+    logger.debug(f"Fetching progress for project {project_id} since ID {since_id} | user: {current_user.email}")
+    
+    # Verify project ownership
+    db_project = await run_in_threadpool(
+        db.query(models.Project).filter(
+            models.Project.id == project_id,
+            models.Project.owner_id == current_user.id
+        ).first
+    )
+    
+    if not db_project:
+        logger.warning(f"Project {project_id} not found or unauthorized | user: {current_user.email}")
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    # Hand the request session's pooled connection back before waiting: each check
+    # below uses its own short-lived session, so a held long-poll pins no connection.
+    db.close()
+    
+    try:
+        deadline = time.monotonic() + min(max(float(wait), 0.0), _PROGRESS_MAX_WAIT)
+        while True:
+            # Blocking queries run in the threadpool, off the event loop.
+            progress_data, status = await run_in_threadpool(_read_progress, project_id, since_id)
+            if progress_data or status != 'processing' or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(_PROGRESS_WAIT_INTERVAL)
         
         return {
             'project_id': project_id,
             'progress': progress_data,
-            'current_status': db_project.preprocessing_status
+            'current_status': status
         }
     
     except Exception as e:
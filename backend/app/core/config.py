@@ -65,6 +65,15 @@ class Settings:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_EMBEDDING_MODEL: str = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
     
+    # pgvector HNSW tuning (index build params apply when the index is first created)
+    PGVECTOR_HNSW_M: int = int(os.getenv("PGVECTOR_HNSW_M", "24"))
+    PGVECTOR_HNSW_EFC: int = int(os.getenv("PGVECTOR_HNSW_EFC", "200"))
+    PGVECTOR_EF_SEARCH: int = int(os.getenv("PGVECTOR_EF_SEARCH", "64"))
+    # Two-stage search: HNSW over binary-quantized embeddings, then exact re-rank of
+    # k * PGVECTOR_RERANK_FACTOR candidates (requires pgvector >= 0.7).
+    PGVECTOR_QUANTIZED_SEARCH: bool = os.getenv("PGVECTOR_QUANTIZED_SEARCH", "false").lower() in ("1", "true", "yes")
+    PGVECTOR_RERANK_FACTOR: int = int(os.getenv("PGVECTOR_RERANK_FACTOR", "10"))
+    
     # Langfuse
     LANGFUSE_SECRET_KEY: str = os.getenv("LANGFUSE_SECRET_KEY", "")
     LANGFUSE_PUBLIC_KEY: str = os.getenv("LANGFUSE_PUBLIC_KEY", "")
@@ -20,7 +20,13 @@ def make_final_aggregator_node():
         persona_mode = cfg.get("persona_mode", "both")
         verbosity = cfg.get("doc_verbosity", "medium")
 
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=os.getenv("OPENAI_API_KEY"))
+        stream_handler = state.get("stream_handler")
+        llm = ChatOpenAI(
+            model="gpt-4o-mini",
+            temperature=0,
+            api_key=os.getenv("OPENAI_API_KEY"),
+            streaming=stream_handler is not None,
+        )
 
         retrieved_context = state.get("retrieved_context", "No code context available")
         file_structure = state.get("file_structure", "No file structure available")
@@ -72,7 +78,8 @@ def make_final_aggregator_node():
         4.Concrete actions or follow-up questions
 
         Now provide your structured response:"""
-        config = {"callbacks": [state.get("langfuse_handler")]} if state.get("langfuse_handler") else {}
+        callbacks = [h for h in (state.get("langfuse_handler"), stream_handler) if h is not None]
+        config = {"callbacks": callbacks} if callbacks else {}
         synth = llm.invoke([HumanMessage(content=synth_prompt)], config=config)
 
         parts: List[str] = []
@@ -21,8 +21,11 @@ def make_vector_context_node(db: Session):
         try:
             from ..vector_store import vector_search_project, format_chunks_for_prompt
 
-            chunks = vector_search_project(db=db, project_id=state["project_id"], query=state["question"], k=top_k)
-            context = format_chunks_for_prompt(chunks, max_chars=int(agent_settings.get("vector_max_chars", 12000)))
+            max_chars = int(agent_settings.get("vector_max_chars", 12000))
+            chunks = vector_search_project(
+                db=db, project_id=state["project_id"], query=state["question"], k=top_k, max_chars=max_chars
+            )
+            context = format_chunks_for_prompt(chunks, max_chars=max_chars)
 
             chunk_dicts = [
                 {
@@ -39,6 +39,8 @@ class ChatAgentState(TypedDict, total=False):
     agent_trace: Annotated[List[str], operator.add]
     # langfuse
     langfuse_handler: object
+    # Optional LangChain callback receiving final-answer tokens as they are generated.
+    stream_handler: object
 
 
 DEFAULT_CHAT_CONFIG: Dict[str, Any] = {
@@ -57,7 +57,7 @@ def retrieve_code_chunks(query: str) -> str:
         # Use pgvector-backed semantic search over stored chunks
         from .vector_store import vector_search_project, format_chunks_for_prompt
 
-        chunks = vector_search_project(db=db, project_id=project_id, query=query, k=12)
+        chunks = vector_search_project(db=db, project_id=project_id, query=query, k=12, max_chars=12000)
         if not chunks:
             return "No relevant code chunks found."
 
@@ -17,9 +17,10 @@ import os
 import operator
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from langchain_openai import ChatOpenAI
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.messages import HumanMessage
 from langfuse import get_client
 from langfuse.langchain import CallbackHandler
@@ -337,6 +338,17 @@ def build_multi_agent_chat_graph(db: Session):
     return workflow.compile()
 
 
+class _TokenCallbackHandler(BaseCallbackHandler):
+    """Forwards streamed LLM tokens to a plain callable."""
+
+    def __init__(self, on_token: Callable[[str], None]):
+        self._on_token = on_token
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if token:
+            self._on_token(token)
+
+
 def run_multi_agent_chat(
     db: Session,
     project_id: int,
@@ -344,8 +356,14 @@ def run_multi_agent_chat(
     session_id: Optional[int],
     question: str,
     config_id: Optional[int] = None,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
-    """Execute the multi-agent chat workflow and return response + metadata."""
+    """
+    Execute the multi-agent chat workflow and return response + metadata.
+
+    When `on_token` is given, the final synthesis step streams and each generated
+    token is passed to it as soon as it arrives.
+    """
     graph = build_multi_agent_chat_graph(db)
 
     trace_id = uuid.uuid4().hex
@@ -383,6 +401,8 @@ def run_multi_agent_chat(
             "agent_trace": [],
             "langfuse_handler": handler,
         }
+        if on_token is not None:
+            initial_state["stream_handler"] = _TokenCallbackHandler(on_token)
 
         final_state = graph.invoke(initial_state)
         root_span.update(output=final_state.get("final_answer", ""))
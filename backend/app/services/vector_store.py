@@ -11,20 +11,26 @@ This module:
 from __future__ import annotations
 
 import hashlib
+import io
 import math
+import multiprocessing
 import os
+import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from itertools import accumulate, repeat
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
 
 from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
 
 from ..core.config import settings
 from ..core.logging import get_logger
-from psycopg2.extras import execute_values  # type: ignore
 
 logger = get_logger(__name__)
 
@@ -68,8 +74,7 @@ except Exception:
         LANGCHAIN_SPLITTER_AVAILABLE = False
 
 
-@dataclass
-class ChunkRow:
+class ChunkRow(NamedTuple):
     id: int
     path: str
     start_line: Optional[int]
@@ -83,11 +88,38 @@ def _vector_literal(vec: Sequence[float]) -> str:
     return "[" + ", ".join(f"{float(x):.8f}" for x in vec) + "]"
 
 
+# Embedding dims whose schema was seen complete (and committed) by this process.
+_PGVECTOR_SCHEMA_READY: Set[int] = set()
+# Optional indexes this database could not create (e.g. pgvector too old).
+_PGVECTOR_UNSUPPORTED_INDEXES: Set[str] = set()
+
+
+def _pgvector_schema_complete(conn: Connection) -> bool:
+    """One catalog lookup (no locks): do the table and its indexes exist?"""
+    names = ["project_code_chunks", "idx_pcc_project_id", "idx_pcc_project_path", "idx_pcc_embedding_hnsw"]
+    if settings.PGVECTOR_QUANTIZED_SEARCH:
+        names.append("idx_pcc_embedding_bits_hnsw")
+    names = [n for n in names if n not in _PGVECTOR_UNSUPPORTED_INDEXES]
+    return bool(
+        conn.execute(
+            text("SELECT bool_and(to_regclass(n) IS NOT NULL) FROM unnest(CAST(:names AS text[])) AS n"),
+            {"names": names},
+        ).scalar()
+    )
+
+
 def ensure_pgvector_schema(conn: Connection, *, embedding_dim: int) -> None:
     """
     Create extension/table/indexes if missing.
-    Safe to call repeatedly.
+    Safe to call repeatedly: once the schema is found complete it is remembered per
+    process and embedding dim, so searches skip the DDL (and its locks/savepoints).
+    The DDL run itself is not remembered, as the caller's transaction may roll it back.
     """
+    if int(embedding_dim) in _PGVECTOR_SCHEMA_READY:
+        return
+    if _pgvector_schema_complete(conn):
+        _PGVECTOR_SCHEMA_READY.add(int(embedding_dim))
+        return
     t0 = time.time()
     logger.debug(f"Ensuring pgvector schema (embedding_dim={int(embedding_dim)})")
     # Extension (in docker this is already created, but this makes local runs safer)
@@ -118,26 +150,60 @@ def ensure_pgvector_schema(conn: Connection, *, embedding_dim: int) -> None:
     conn.execute(text("CREATE INDEX IF NOT EXISTS idx_pcc_project_id ON project_code_chunks(project_id);"))
     conn.execute(text("CREATE INDEX IF NOT EXISTS idx_pcc_project_path ON project_code_chunks(project_id, path);"))
 
-    # Vector index (prefer HNSW if available; fall back silently if not supported)
+    # Vector index (prefer HNSW if available; fall back silently if not supported).
+    # m / ef_construction only take effect when the index is (re)created.
+    hnsw_m = int(settings.PGVECTOR_HNSW_M)
+    hnsw_efc = int(settings.PGVECTOR_HNSW_EFC)
+    # Each optional index is created under a SAVEPOINT: a failure would otherwise leave
+    # the surrounding transaction aborted and fail the search that follows.
     try:
-        conn.execute(
-            text(
-                """
-                CREATE INDEX IF NOT EXISTS idx_pcc_embedding_hnsw
-                ON project_code_chunks
-                USING hnsw (embedding vector_cosine_ops);
-                """
+        with conn.begin_nested():
+            conn.execute(
+                text(
+                    f"""
+                    CREATE INDEX IF NOT EXISTS idx_pcc_embedding_hnsw
+                    ON project_code_chunks
+                    USING hnsw (embedding vector_cosine_ops)
+                    WITH (m = {hnsw_m}, ef_construction = {hnsw_efc});
+                    """
+                )
             )
-        )
-        logger.debug("Ensured HNSW index idx_pcc_embedding_hnsw exists (or created)")
+        logger.debug(f"Ensured HNSW index idx_pcc_embedding_hnsw exists (m={hnsw_m}, ef_construction={hnsw_efc})")
     except Exception as e:
         # Older pgvector may not support HNSW; we'll rely on exact scan or user can add ivfflat.
         logger.warning(f"HNSW index creation skipped/failed: {e}")
-    finally:
-        logger.debug(f"ensure_pgvector_schema done in {(time.time() - t0):.3f}s")
+        _PGVECTOR_UNSUPPORTED_INDEXES.add("idx_pcc_embedding_hnsw")
+
+    # Expression index over binary-quantized embeddings for two-stage search.
+    if settings.PGVECTOR_QUANTIZED_SEARCH:
+        try:
+            with conn.begin_nested():
+                conn.execute(
+                    text(
+                        f"""
+                        CREATE INDEX IF NOT EXISTS idx_pcc_embedding_bits_hnsw
+                        ON project_code_chunks
+                        USING hnsw ((binary_quantize(embedding)::bit({int(embedding_dim)})) bit_hamming_ops)
+                        WITH (m = {hnsw_m}, ef_construction = {hnsw_efc});
+                        """
+                    )
+                )
+            logger.debug("Ensured quantized HNSW index idx_pcc_embedding_bits_hnsw exists (or created)")
+        except Exception as e:
+            logger.warning(f"Quantized HNSW index creation skipped/failed: {e}")
+            _PGVECTOR_UNSUPPORTED_INDEXES.add("idx_pcc_embedding_bits_hnsw")
+
+    logger.debug(f"ensure_pgvector_schema done in {(time.time() - t0):.3f}s")
+
+
+# Chunk rows per project, for sizing ef_search on pgvector < 0.8. Set by the indexer
+# and counted once on a miss; dropped whenever a project's chunks are deleted. Per
+# process, so another worker's reindex only skews ef_search until the next restart.
+_PROJECT_CHUNK_COUNTS: Dict[int, int] = {}
 
 
 def delete_project_chunks(db: Session, *, project_id: int) -> int:
+    _PROJECT_CHUNK_COUNTS.pop(project_id, None)
     res = db.execute(text("DELETE FROM project_code_chunks WHERE project_id = :project_id"), {"project_id": project_id})
     # SQLAlchemy 2 returns a Result; rowcount is available.
     return int(getattr(res, "rowcount", 0) or 0)
@@ -239,22 +305,30 @@ def _tree_sitter_language_for_ext(file_ext: str):
         return None
 
 
-_TREE_SITTER_PARSER_CACHE: Dict[str, Any] = {}
+# Languages are immutable and shared; parsers are stateful and not safe to use from
+# several threads at once, so each thread keeps its own parser per file extension.
+_TREE_SITTER_LANGUAGE_CACHE: Dict[str, Any] = {}
+_TREE_SITTER_PARSERS = threading.local()
 
 
 def _get_tree_sitter_parser(file_ext: str):
     """
-    Get (and cache) a Tree-sitter parser for supported languages.
+    Get (and cache, per thread) a Tree-sitter parser for supported languages.
     Returns None if Tree-sitter isn't available or language unsupported.
     """
     if not TREE_SITTER_AVAILABLE:
         return None
-    if file_ext in _TREE_SITTER_PARSER_CACHE:
-        return _TREE_SITTER_PARSER_CACHE[file_ext]
-
-    lang = _tree_sitter_language_for_ext(file_ext)
+    parsers = getattr(_TREE_SITTER_PARSERS, "by_ext", None)
+    if parsers is None:
+        parsers = _TREE_SITTER_PARSERS.by_ext = {}
+    if file_ext in parsers:
+        return parsers[file_ext]
+
+    if file_ext not in _TREE_SITTER_LANGUAGE_CACHE:
+        _TREE_SITTER_LANGUAGE_CACHE[file_ext] = _tree_sitter_language_for_ext(file_ext)
+    lang = _TREE_SITTER_LANGUAGE_CACHE[file_ext]
     if not lang:
-        _TREE_SITTER_PARSER_CACHE[file_ext] = None
+        parsers[file_ext] = None
         return None
 
     parser = Parser()
@@ -264,10 +338,17 @@ def _get_tree_sitter_parser(file_ext: str):
     except Exception:
         parser.language = lang
 
-    _TREE_SITTER_PARSER_CACHE[file_ext] = parser
+    parsers[file_ext] = parser
     return parser
 
 
+def _discard_tree_sitter_parser(file_ext: str) -> None:
+    """Drop this thread's cached parser (e.g. after a failed parse) so it is rebuilt."""
+    parsers = getattr(_TREE_SITTER_PARSERS, "by_ext", None)
+    if parsers is not None:
+        parsers.pop(file_ext, None)
+
+
 def _get_chunkable_node_types(file_ext: str) -> set:
     node_types_map = {
         # Python
@@ -302,12 +383,19 @@ def _utf8_byte_offsets(content: str) -> List[int]:
     Return a list where entry i is the UTF-8 byte offset of the i-th character.
     The last entry is total bytes (len in UTF-8).
     """
-    offsets = [0]
-    total = 0
-    for ch in content:
-        total += len(ch.encode("utf-8"))
-        offsets.append(total)
-    return offsets
+    return list(accumulate(map(_utf8_char_width, content), initial=0))
+
+
+def _utf8_char_width(ch: str) -> int:
+    # Width from the code point avoids encoding every character separately.
+    o = ord(ch)
+    if o < 0x80:
+        return 1
+    if o < 0x800:
+        return 2
+    if o < 0x10000:
+        return 3
+    return 4
 
 
 def _char_index_from_byte(byte_offsets: List[int], byte_pos: int) -> int:
@@ -338,6 +426,9 @@ def _extract_tree_sitter_chunks(
     try:
         tree = parser.parse(content.encode("utf-8"))
     except Exception:
+        # Don't reuse a parser that may be left in a bad state; the caller falls
+        # back to the recursive splitter for this file.
+        _discard_tree_sitter_parser(file_ext)
         return []
 
     root = tree.root_node
@@ -345,13 +436,18 @@ def _extract_tree_sitter_chunks(
     if not target_types:
         return []
 
-    byte_offsets = _utf8_byte_offsets(content)
+    # Most source files are pure ASCII: one byte per character, so Tree-sitter
+    # byte positions are already character indexes and no offset table is needed.
+    if content.isascii():
+        char_from_byte = int
+    else:
+        char_from_byte = partial(_char_index_from_byte, _utf8_byte_offsets(content))
     chunks: List[Tuple[int, int, str]] = []
 
     def traverse(node) -> None:
         if node.type in target_types:
-            start_char = _char_index_from_byte(byte_offsets, int(node.start_byte))
-            end_char = _char_index_from_byte(byte_offsets, int(node.end_byte))
+            start_char = char_from_byte(node.start_byte)
+            end_char = char_from_byte(node.end_byte)
             if (end_char - start_char) <= max_chunk_chars * 2:
                 chunks.append((start_char, end_char, node.type))
                 return  # don't descend into children of a chosen chunk
@@ -590,6 +686,30 @@ def _openai_client():
     return OpenAI(api_key=api_key) if api_key else OpenAI()
 
 
+def _embed_batch(
+    client,
+    batch: List[str],
+    *,
+    embedding_model: str,
+    max_retries: int,
+    retry_backoff_sec: float,
+) -> List[List[float]]:
+    attempt = 0
+    while True:
+        try:
+            resp = client.embeddings.create(model=embedding_model, input=batch)
+            # Ensure order is preserved
+            data = sorted(resp.data, key=lambda d: d.index)
+            return [list(d.embedding) for d in data]
+        except Exception as e:
+            attempt += 1
+            if attempt > max_retries:
+                raise
+            sleep_s = retry_backoff_sec * (2 ** (attempt - 1)) + (0.1 * attempt)
+            logger.warning(f"Embedding batch failed (attempt {attempt}/{max_retries}): {e}; sleeping {sleep_s:.1f}s")
+            time.sleep(sleep_s)
+
+
 def embed_texts_openai(
     *,
     texts: Sequence[str],
@@ -597,35 +717,42 @@ def embed_texts_openai(
     batch_size: int = 64,
     max_retries: int = 3,
     retry_backoff_sec: float = 1.5,
+    max_workers: Optional[int] = None,
 ) -> List[List[float]]:
+    """
+    Embed texts in batches of `batch_size`. Batches are network-bound, so up to
+    `max_workers` requests run concurrently (default: OPENAI_EMBEDDING_CONCURRENCY
+    env var, else 4); results keep input order.
+    """
     if not texts:
         return []
 
+    if max_workers is None:
+        env_workers = os.getenv("OPENAI_EMBEDDING_CONCURRENCY", "").strip()
+        max_workers = int(env_workers) if env_workers.isdigit() else 4
+
     client = _openai_client()
-    out: List[List[float]] = []
-    i = 0
+    batches = [list(texts[i : i + batch_size]) for i in range(0, len(texts), batch_size)]
+    embed = partial(
+        _embed_batch,
+        client,
+        embedding_model=embedding_model,
+        max_retries=max_retries,
+        retry_backoff_sec=retry_backoff_sec,
+    )
     t0 = time.time()
-    while i < len(texts):
-        batch = list(texts[i : i + batch_size])
-        attempt = 0
-        while True:
-            try:
-                resp = client.embeddings.create(model=embedding_model, input=batch)
-                # Ensure order is preserved
-                data = sorted(resp.data, key=lambda d: d.index)
-                out.extend([list(d.embedding) for d in data])
-                break
-            except Exception as e:
-                attempt += 1
-                if attempt > max_retries:
-                    raise
-                sleep_s = retry_backoff_sec * (2 ** (attempt - 1)) + (0.1 * attempt)
-                logger.warning(f"Embedding batch failed (attempt {attempt}/{max_retries}): {e}; sleeping {sleep_s:.1f}s")
-                time.sleep(sleep_s)
-        i += batch_size
+    workers = max(1, min(int(max_workers), len(batches)))
+    out: List[List[float]] = []
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for vectors in ex.map(embed, batches):
+                out.extend(vectors)
+    else:
+        for batch in batches:
+            out.extend(embed(batch))
     logger.debug(
-        f"Embeddings created (model={embedding_model}, texts={len(texts)}, batch_size={int(batch_size)}) "
-        f"in {(time.time() - t0):.3f}s"
+        f"Embeddings created (model={embedding_model}, texts={len(texts)}, batch_size={int(batch_size)}, "
+        f"workers={workers}) in {(time.time() - t0):.3f}s"
     )
     return out
 
@@ -642,6 +769,109 @@ def _infer_embedding_dim(embedding_model: str) -> int:
     return 0
 
 
+def _chunk_file_worker(
+    rel_path: str,
+    abs_path: str,
+    chunk_chars: int,
+    chunk_overlap: int,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Read and chunk a single file. Returns None when the file is unreadable or empty.
+    Top-level (picklable) so it can run in a process pool; Tree-sitter parsers are
+    created lazily per process by `_get_tree_sitter_parser`.
+    """
+    try:
+        content = Path(abs_path).read_text(encoding="utf-8", errors="ignore")
+    except Exception as e:
+        logger.warning(f"Failed to read file for embedding: {rel_path}: {e}")
+        return None
+    if not content.strip():
+        return None
+    out = split_text_to_code_chunks(
+        path=rel_path,
+        content=content,
+        chunk_chars=chunk_chars,
+        chunk_overlap=chunk_overlap,
+    )
+    logger.debug(f"Split file into chunks (path={rel_path}, chunks_added={len(out)})")
+    return out
+
+
+# Default cap on chunking processes (VECTOR_CHUNK_WORKERS overrides it).
+_MAX_CHUNK_WORKERS = 8
+
+
+def _chunk_worker_count(n_files: int) -> int:
+    # VECTOR_CHUNK_WORKERS=1 forces in-process chunking (e.g. for debugging).
+    env_workers = os.getenv("VECTOR_CHUNK_WORKERS", "").strip()
+    workers = int(env_workers) if env_workers.isdigit() else min(os.cpu_count() or 1, _MAX_CHUNK_WORKERS)
+    # Small projects aren't worth the process start-up cost.
+    if n_files < 16:
+        return 1
+    return max(1, min(workers, n_files))
+
+
+def _chunk_mp_context() -> multiprocessing.context.BaseContext:
+    # forkserver starts workers from a clean single-threaded server process; spawn
+    # where it is unavailable (non-Unix).
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _collect_file_chunks(
+    rel_paths: Sequence[str],
+    results: Iterable[Optional[List[Dict[str, Any]]]],
+    chunks: List[Dict[str, Any]],
+    progress_tracker=None,
+) -> int:
+    """Append per-file chunk lists (in file order) and report progress. Returns files read."""
+    files_read = 0
+    for idx, (rel_path, file_chunks) in enumerate(zip(rel_paths, results), start=1):
+        if file_chunks is None:
+            continue
+        chunks.extend(file_chunks)
+        files_read += 1
+        if progress_tracker:
+            progress_tracker.update_file_progress(rel_path, idx)
+    return files_read
+
+
+_COPY_READ_SIZE = 1 << 16
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def _copy_line(row: Sequence[Any]) -> str:
+    """Encode one row in COPY text format (tab-separated, \\N for NULL)."""
+    return "\t".join("\\N" if v is None else str(v).translate(_COPY_ESCAPES) for v in row) + "\n"
+
+
+class _LineReader(io.TextIOBase):
+    """Minimal file-like reader over an iterator of lines, for cursor.copy_expert."""
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines = iter(lines)
+        self._buf = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        parts = [self._buf]
+        have = len(self._buf)
+        while size is None or size < 0 or have < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            have += len(line)
+        data = "".join(parts)
+        if size is None or size < 0:
+            self._buf = ""
+            return data
+        self._buf = data[size:]
+        return data[:size]
+
+
 def index_project_chunks_to_pgvector(
     *,
     project_id: int,
@@ -676,29 +906,23 @@ def index_project_chunks_to_pgvector(
 
     chunks: List[Dict[str, Any]] = []
     files_read = 0
-    for idx, fm in enumerate(code_files, start=1):
-        rel_path = str(fm["path"])
-        abs_path = Path(str(fm["absolute_path"]))
-        try:
-            content = abs_path.read_text(encoding="utf-8", errors="ignore")
-        except Exception as e:
-            logger.warning(f"Failed to read file for embedding: {rel_path}: {e}")
-            continue
-        if not content.strip():
-            continue
-        before = len(chunks)
-        chunks.extend(
-            split_text_to_code_chunks(
-                path=rel_path,
-                content=content,
-                chunk_chars=chunk_chars,
-                chunk_overlap=chunk_overlap,
+    rel_paths = [str(fm["path"]) for fm in code_files]
+    abs_paths = [str(fm["absolute_path"]) for fm in code_files]
+    workers = _chunk_worker_count(len(code_files))
+    if workers > 1:
+        # Chunking is CPU-bound Python (tree traversal, offset mapping, slicing),
+        # so fan files out to processes rather than threads to get past the GIL.
+        logger.debug(f"Chunking with process pool (workers={workers}, files={len(code_files)})")
+        # Not fork: this runs inside the multithreaded server process, and a forked
+        # child can deadlock on locks other threads held (logging, HTTP clients).
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_chunk_mp_context()) as ex:
+            results = ex.map(
+                _chunk_file_worker, rel_paths, abs_paths, repeat(chunk_chars), repeat(chunk_overlap), chunksize=8
             )
-        )
-        logger.debug(f"Split file into chunks (path={rel_path}, chunks_added={len(chunks) - before})")
-        files_read += 1
-        if progress_tracker:
-            progress_tracker.update_file_progress(rel_path, idx)
+            files_read = _collect_file_chunks(rel_paths, results, chunks, progress_tracker)
+    else:
+        results = map(_chunk_file_worker, rel_paths, abs_paths, repeat(chunk_chars), repeat(chunk_overlap))
+        files_read = _collect_file_chunks(rel_paths, results, chunks, progress_tracker)
 
     if not chunks:
         logger.info(f"No chunks produced; skipping embedding/indexing (project_id={project_id}, files_indexed={files_read})")
@@ -720,65 +944,244 @@ def index_project_chunks_to_pgvector(
     deleted = delete_project_chunks(db, project_id=project_id)
     logger.info(f"Deleted {deleted} existing chunks for project {project_id}")
 
-    # Embed chunks (batch)
-    texts = [c["content"] for c in chunks]
+    # Embed chunks (batch). Identical content (license headers, boilerplate) is
+    # embedded once and its vector shared by every chunk with the same hash.
+    unique: Dict[str, int] = {}
+    unique_texts: List[str] = []
+    for c in chunks:
+        sha = c["content_sha256"]
+        if sha not in unique:
+            unique[sha] = len(unique_texts)
+            unique_texts.append(c["content"])
     t_embed = time.time()
-    vectors = embed_texts_openai(texts=texts, embedding_model=embedding_model)
+    unique_vectors = embed_texts_openai(texts=unique_texts, embedding_model=embedding_model)
     logger.info(
-        f"Embedding complete (project_id={project_id}, chunks={len(chunks)}, "
+        f"Embedding complete (project_id={project_id}, chunks={len(chunks)}, unique={len(unique_texts)}, "
         f"elapsed={(time.time() - t_embed):.3f}s, model={embedding_model})"
     )
-    if len(vectors) != len(chunks):
-        raise RuntimeError(f"Embedding count mismatch: got {len(vectors)} vectors for {len(chunks)} chunks")
-
-    # Insert rows using psycopg2 execute_values for speed
-    insert_sql = """
-        INSERT INTO project_code_chunks
-          (project_id, path, chunk_index, start_line, end_line, content, content_sha256, embedding)
-        VALUES %s
-    """
-    rows: List[Tuple[Any, ...]] = []
-    for c, v in zip(chunks, vectors):
-        rows.append(
-            (
-                project_id,
-                c["path"],
-                int(c["chunk_index"]),
-                c.get("start_line"),
-                c.get("end_line"),
-                c["content"],
-                c.get("content_sha256"),
-                _vector_literal(v),
-            )
+    if len(unique_vectors) != len(unique_texts):
+        raise RuntimeError(
+            f"Embedding count mismatch: got {len(unique_vectors)} vectors for {len(unique_texts)} unique chunks"
         )
+    vectors = [unique_vectors[unique[c["content_sha256"]]] for c in chunks]
+
+    # Bulk-load rows with COPY: the project's rows were just deleted, so this is
+    # always an initial load. Columns are staged separately and zipped lazily into
+    # COPY text lines, so only the lines currently being sent are materialized
+    # instead of a tuple (with a ~20KB vector literal) per chunk.
+    copy_sql = """
+        COPY project_code_chunks
+          (project_id, path, chunk_index, start_line, end_line, content, content_sha256, embedding)
+        FROM STDIN
+    """
+    n_rows = len(chunks)
+    paths = [c["path"] for c in chunks]
+    chunk_indices = [int(c["chunk_index"]) for c in chunks]
+    start_lines = [c.get("start_line") for c in chunks]
+    end_lines = [c.get("end_line") for c in chunks]
+    contents = [c["content"] for c in chunks]
+    shas = [c.get("content_sha256") for c in chunks]
+    rows = zip(
+        repeat(project_id, n_rows),
+        paths,
+        chunk_indices,
+        start_lines,
+        end_lines,
+        contents,
+        shas,
+        map(_vector_literal, vectors),
+    )
 
-    # Chunked insert to avoid huge payloads
-    batch = 2000
     t_insert = time.time()
     dbapi_conn = db.connection().connection
     with dbapi_conn.cursor() as cursor:
-        execute_values(
-            cursor,
-            insert_sql,
-            rows,
-            template="(%s,%s,%s,%s,%s,%s,%s, (%s)::vector)",
-            page_size=batch,
-        )
+        cursor.copy_expert(copy_sql, _LineReader(map(_copy_line, rows)), size=_COPY_READ_SIZE)
     db.commit()
+    _PROJECT_CHUNK_COUNTS[project_id] = n_rows
     logger.info(
-        f"Inserted chunks (project_id={project_id}, rows={len(rows)}, batch={batch}, elapsed={(time.time() - t_insert):.3f}s)"
+        f"Inserted chunks via COPY (project_id={project_id}, rows={n_rows}, elapsed={(time.time() - t_insert):.3f}s)"
     )
 
     return {
         "success": True,
         "files_indexed": files_read,
-        "chunks_written": len(rows),
+        "chunks_written": n_rows,
         "embedding_dim": dim,
         "embedding_model": embedding_model,
         "project_root": str(project_root),
     }
 
 
+# Upper bound pgvector accepts for hnsw.ef_search.
+_HNSW_MAX_EF_SEARCH = 1000
+# Installed pgvector version, looked up once per process.
+_PGVECTOR_VERSION_CACHE: Dict[str, Tuple[int, ...]] = {}
+
+
+def _pgvector_version(db: Session) -> Tuple[int, ...]:
+    version = _PGVECTOR_VERSION_CACHE.get("vector")
+    if version is None:
+        raw = db.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")).scalar() or "0"
+        version = tuple(int(part) for part in raw.split(".") if part.isdigit())
+        _PGVECTOR_VERSION_CACHE["vector"] = version
+    return version
+
+
+def _search_settings(db: Session, *, project_id: int, k: int) -> Dict[str, str]:
+    """
+    Planner settings for one project-filtered vector search asking the index for `k` rows.
+
+    HNSW walks the global index and applies `WHERE project_id = ...` afterwards, and a
+    scan yields at most hnsw.ef_search rows, so with several indexed projects a search
+    could return fewer than k chunks (or none). To avoid that:
+    - pgvector >= 0.8: iterative scans (hnsw.iterative_scan = relaxed_order) keep
+      walking the graph until enough rows pass the filter (bounded by
+      hnsw.max_scan_tuples). Relaxed order is fine: results are re-sorted by score.
+    - older pgvector: ef_search is scaled by the inverse of the project's share of the
+      table. When that exceeds pgvector's cap, index scans are disabled so the planner
+      uses the project_id btree (bitmap scan) and an exact sort instead.
+    enable_bitmapscan=off otherwise keeps the planner from trading HNSW's ordered
+    traversal for a bitmap scan on the btree indexes.
+    """
+    ef_search = max(int(settings.PGVECTOR_EF_SEARCH), int(k))
+    out = {"enable_bitmapscan": "off"}
+    if _pgvector_version(db) >= (0, 8):
+        out["hnsw.iterative_scan"] = "relaxed_order"
+    else:
+        project_rows = _PROJECT_CHUNK_COUNTS.get(project_id)
+        if project_rows is None:
+            project_rows, table_rows = db.execute(
+                text(
+                    "SELECT (SELECT count(*) FROM project_code_chunks WHERE project_id = :project_id), "
+                    "(SELECT reltuples FROM pg_class WHERE oid = 'project_code_chunks'::regclass)"
+                ),
+                {"project_id": project_id},
+            ).one()
+            _PROJECT_CHUNK_COUNTS[project_id] = int(project_rows)
+        else:
+            # The table total is a catalog estimate: no scan.
+            table_rows = db.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = 'project_code_chunks'::regclass")
+            ).scalar()
+        if project_rows:
+            ef_search = math.ceil(ef_search * max(float(table_rows), float(project_rows)) / project_rows)
+        if ef_search > _HNSW_MAX_EF_SEARCH:
+            out = {"enable_indexscan": "off"}
+    out["hnsw.ef_search"] = str(min(_HNSW_MAX_EF_SEARCH, ef_search))
+    return out
+
+
+def _set_configs(db: Session, values: Dict[str, Optional[str]]) -> None:
+    # set_config(..., true) behaves like SET LOCAL but accepts bound parameters; a
+    # NULL value resets the setting.
+    params: Dict[str, Optional[str]] = {}
+    calls = []
+    for i, (name, value) in enumerate(values.items()):
+        params[f"n{i}"], params[f"v{i}"] = name, value
+        calls.append(f"set_config(:n{i}, :v{i}, true)")
+    db.execute(text("SELECT " + ", ".join(calls)), params)
+
+
+@contextmanager
+def _search_settings_applied(db: Session, *, project_id: int, k: int) -> Iterator[None]:
+    """
+    Apply `_search_settings` for the statements run inside the block, then restore the
+    previous values. SET LOCAL alone would last until the session's transaction ends
+    and affect later queries on the same session (e.g. chat persistence); a SAVEPOINT
+    would not help, as RELEASE keeps SET LOCAL values. If the block raises, nothing
+    is restored: the caller rolls the transaction back, which discards them.
+    """
+    gucs = _search_settings(db, project_id=project_id, k=k)
+    names = list(gucs)
+    params: Dict[str, Optional[str]] = {}
+    for i, (name, value) in enumerate(gucs.items()):
+        params[f"n{i}"], params[f"v{i}"] = name, value
+    # Read the old values and set the new ones in one round trip. Within a single
+    # target list the evaluation order is unspecified, so the reads sit in a
+    # subquery that OFFSET 0 keeps the planner from flattening.
+    reads = ", ".join(f"current_setting(:n{i}, true) AS v{i}" for i in range(len(names)))
+    sets = ", ".join(f"set_config(:n{i}, :v{i}, true)" for i in range(len(names)))
+    row = db.execute(text(f"SELECT p.*, {sets} FROM (SELECT {reads} OFFSET 0) p"), params).one()
+    previous = row[: len(names)]
+    yield
+    _set_configs(db, dict(zip(names, previous)))
+
+
+def _chunk_row(r: Sequence[Any]) -> ChunkRow:
+    # Row layout: id, path, start_line, end_line, content, score. psycopg2 already
+    # returns native int/str/float for these columns, so no per-field coercion.
+    row = ChunkRow._make(r)
+    return row if row.score is not None else row._replace(score=math.inf)
+
+
+@lru_cache(maxsize=16)
+def _search_sql(*, path_filter: bool, budgeted: bool, quantized: bool, dim: int) -> TextClause:
+    """
+    Build the vector-search statement for one combination of filters/options.
+    The SQL only varies by these flags (values are bound parameters), so each
+    variant is assembled and parsed into a TextClause once per process.
+    """
+    where = ["c.project_id = :project_id"]
+    if path_filter:
+        where.append("c.path LIKE :path_prefix")
+
+    # Cosine distance (<=>) matches the HNSW index opclass (vector_cosine_ops), so the
+    # planner can serve ORDER BY ... LIMIT from the index. The inner query orders by
+    # the raw operator (required for index use); the outer one reuses its score.
+    # The query vector appears once in the SQL text (the FROM-less `q` subquery is
+    # flattened into a constant), so its ~20KB literal is sent and parsed only once.
+    if quantized:
+        # Two-stage: Hamming-distance HNSW over the bit-quantized index fetches
+        # k * rerank_factor candidates (a fraction of the bytes of float traversal),
+        # then candidates are re-ranked by exact cosine distance.
+        nearest_sql = f"""
+            SELECT id, path, start_line, end_line, content, score
+            FROM (
+                SELECT c.id, c.path, c.start_line, c.end_line, c.content,
+                       c.embedding <=> q.vec AS score
+                FROM project_code_chunks c, (SELECT CAST(:q AS vector) AS vec) q
+                WHERE {' AND '.join(where)}
+                ORDER BY binary_quantize(c.embedding)::bit({int(dim)}) <~> binary_quantize(q.vec)
+                LIMIT :k_cand
+            ) cand
+            ORDER BY score
+            LIMIT :k
+        """
+    else:
+        nearest_sql = f"""
+            SELECT c.id, c.path, c.start_line, c.end_line, c.content,
+                   c.embedding <=> q.vec AS score
+            FROM project_code_chunks c, (SELECT CAST(:q AS vector) AS vec) q
+            WHERE {' AND '.join(where)}
+            ORDER BY c.embedding <=> q.vec
+            LIMIT :k
+        """
+    if not budgeted:
+        return text(
+            f"""
+            SELECT id, path, start_line, end_line, content, score
+            FROM ({nearest_sql}) t
+            ORDER BY score
+            """
+        )
+    # Keep a row while the content before it is still under budget (the first
+    # row is always kept, matching format_chunks_for_prompt).
+    return text(
+        f"""
+        SELECT id, path, start_line, end_line, content, score
+        FROM (
+            SELECT t.*,
+                   SUM(length(t.content)) OVER (
+                       ORDER BY t.score ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                   ) AS used
+            FROM ({nearest_sql}) t
+        ) s
+        WHERE used - length(content) < :max_chars
+        ORDER BY score
+        """
+    )
+
+
 def vector_search_project(
     *,
     db: Session,
@@ -787,7 +1190,13 @@ def vector_search_project(
     k: int = 12,
     embedding_model: Optional[str] = None,
     path_prefix: Optional[str] = None,
+    max_chars: Optional[int] = None,
 ) -> List[ChunkRow]:
+    """
+    Return the k chunks nearest to `query`. When `max_chars` is given, rows after the
+    point where the running content length reaches the budget are dropped in SQL, so
+    chunks that `format_chunks_for_prompt` would discard are never transferred.
+    """
     embedding_model = embedding_model or settings.OPENAI_EMBEDDING_MODEL
 
     t0 = time.time()
@@ -804,42 +1213,28 @@ def vector_search_project(
     db_conn = db.connection()
     ensure_pgvector_schema(db_conn, embedding_dim=dim)
 
-    where = ["project_id = :project_id"]
     params: Dict[str, Any] = {
         "project_id": project_id,
         "q": _vector_literal(qvec),
         "k": int(k),
     }
     if path_prefix:
-        where.append("path LIKE :path_prefix")
         params["path_prefix"] = f"{path_prefix}%"
 
-    # Use L2 distance operator (<->) for broad compatibility.
-    sql = text(
-        f"""
-        SELECT id, path, start_line, end_line, content,
-               (embedding <-> (:q)::vector) AS score
-        FROM project_code_chunks
-        WHERE {' AND '.join(where)}
-        ORDER BY embedding <-> (:q)::vector
-        LIMIT :k
-        """
+    sql = _search_sql(
+        path_filter=bool(path_prefix),
+        budgeted=max_chars is not None,
+        quantized=bool(settings.PGVECTOR_QUANTIZED_SEARCH),
+        dim=int(dim),
     )
-
-    res = db.execute(sql, params)
-    rows = res.fetchall()
-    out: List[ChunkRow] = []
-    for r in rows:
-        out.append(
-            ChunkRow(
-                id=int(r[0]),
-                path=str(r[1]),
-                start_line=(int(r[2]) if r[2] is not None else None),
-                end_line=(int(r[3]) if r[3] is not None else None),
-                content=str(r[4]),
-                score=float(r[5]) if r[5] is not None else math.inf,
-            )
-        )
+    if settings.PGVECTOR_QUANTIZED_SEARCH:
+        params["k_cand"] = int(k) * max(1, int(settings.PGVECTOR_RERANK_FACTOR))
+    if max_chars is not None:
+        params["max_chars"] = int(max_chars)
+
+    with _search_settings_applied(db, project_id=project_id, k=params.get("k_cand", params["k"])):
+        rows = db.execute(sql, params).fetchall()
+    out: List[ChunkRow] = [_chunk_row(r) for r in rows]
     logger.debug(f"Vector search done (project_id={project_id}, results={len(out)}, elapsed={(time.time() - t0):.3f}s)")
     return out
 
@@ -848,16 +1243,20 @@ def format_chunks_for_prompt(chunks: Sequence[ChunkRow], *, max_chars: int = 120
     """
     Format chunk list into a single context string (bounded by max_chars).
     """
-    parts: List[str] = []
+    buf = io.StringIO()
     used = 0
     for c in chunks:
-        loc = c.path
         if c.start_line is not None and c.end_line is not None:
-            loc = f"{loc}:{c.start_line}-{c.end_line}"
-        block = f"=== {loc} (dist={c.score:.4f}) ===\n{c.content}\n"
-        if used + len(block) > max_chars and parts:
+            header = f"=== {c.path}:{c.start_line}-{c.end_line} (dist={c.score:.4f}) ==="
+        else:
+            header = f"=== {c.path} (dist={c.score:.4f}) ==="
+        # header + "\n" + content + "\n" (the separating blank line is not budgeted)
+        size = len(header) + len(c.content) + 2
+        if used + size > max_chars and used:
             break
-        parts.append(block)
-        used += len(block)
-    return "\n".join(parts).strip()
-
+        buf.write(header)
+        buf.write("\n")
+        buf.write(c.content)
+        buf.write("\n\n")
+        used += size
+    return buf.getvalue().strip()
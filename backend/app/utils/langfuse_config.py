@@ -1,14 +1,20 @@
 """
 Langfuse configuration for LLM observability and tracing.
 """
+from __future__ import annotations
+
 import os
-from typing import Any, Optional
-from langfuse import Langfuse
-from langfuse.langchain import CallbackHandler
-from langfuse.types import TraceContext
+import threading
+from typing import TYPE_CHECKING, Any, Optional
 
 from ..core.logging import get_logger
 
+if TYPE_CHECKING:
+    # The SDK pulls in OpenTelemetry and its exporters; import it only once
+    # Langfuse is known to be enabled (see LangfuseConfig.__init__).
+    from langfuse import Langfuse
+    from langfuse.langchain import CallbackHandler
+
 logger = get_logger(__name__)
 
 
@@ -16,7 +22,6 @@ class LangfuseConfig:
     """Langfuse configuration singleton."""
     
     _instance: Optional['LangfuseConfig'] = None
-    _callback_handler: Optional[CallbackHandler] = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -30,14 +35,57 @@ class LangfuseConfig:
             self.public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
             self.base_url = os.getenv("LANGFUSE_BASE_URL", "https://us.cloud.langfuse.com")
             self.enabled = bool(self.secret_key and self.public_key)
+            # Batched export: the backend is long-running, so buffer spans and flush
+            # in batches rather than paying export overhead on every LLM call.
+            self.flush_at = int(os.getenv("LANGFUSE_FLUSH_AT", "50"))
+            self.flush_interval = float(os.getenv("LANGFUSE_FLUSH_INTERVAL", "5"))
+            self._client: Optional[Langfuse] = None
+            self._client_lock = threading.Lock()
             
             if self.enabled:
-                logger.info(f"Langfuse enabled | base_url: {self.base_url}")
+                try:
+                    from langfuse import Langfuse as _Langfuse
+                    from langfuse.langchain import CallbackHandler as _CallbackHandler
+                    from langfuse.types import TraceContext as _TraceContext
+
+                    self._Langfuse = _Langfuse
+                    self._CallbackHandler = _CallbackHandler
+                    self._TraceContext = _TraceContext
+                except Exception as e:
+                    logger.error(f"Failed to import Langfuse SDK; tracing disabled: {e}")
+                    self.enabled = False
+
+            if self.enabled:
+                # Export the batching settings too, so SDK clients created implicitly
+                # (e.g. by CallbackHandler) pick up the same values.
+                os.environ.setdefault("LANGFUSE_FLUSH_AT", str(self.flush_at))
+                os.environ.setdefault("LANGFUSE_FLUSH_INTERVAL", str(self.flush_interval))
+                logger.info(
+                    f"Langfuse enabled | base_url: {self.base_url} | "
+                    f"flush_at: {self.flush_at} | flush_interval: {self.flush_interval}s"
+                )
             else:
                 logger.warning("Langfuse disabled - missing API keys")
             
             self.initialized = True
     
+    def _get_client(self) -> Optional[Langfuse]:
+        """
+        Return the shared Langfuse client, creating it on first use.
+        The SDK batches exports per client, so one instance is reused for all traces.
+        """
+        if not self.enabled:
+            return None
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        self._client = self._Langfuse(flush_at=self.flush_at, flush_interval=self.flush_interval)
+                    except Exception as e:
+                        logger.error(f"Failed to initialize Langfuse client: {e}", exc_info=True)
+                        return None
+        return self._client
+    
     def get_callback_handler(
         self,
         trace_name: Optional[str] = None,
@@ -59,12 +107,13 @@ class LangfuseConfig:
         Returns:
             CallbackHandler instance or None if disabled
         """
-        if not self.enabled:
+        if not self.enabled or self._get_client() is None:
             return None
         
         try:
-            # Initialize handler - uses env vars automatically
-            handler = CallbackHandler()
+            # Handlers carry per-trace attributes, so one is created per call; they
+            # attach to the shared client initialized above instead of building their own.
+            handler = self._CallbackHandler()
             
             # Set trace properties as attributes
             if trace_name:
@@ -96,10 +145,10 @@ class LangfuseConfig:
         """
         Create a root Langfuse trace and return its id.
         """
-        if not self.enabled:
+        client = self._get_client()
+        if client is None:
             return None
         try:
-            client = Langfuse()
             trace_id = client.create_trace_id()
             client.update_current_trace(
                 name=trace_name,
@@ -121,11 +170,11 @@ class LangfuseConfig:
         """
         Create a Langfuse callback handler attached to an existing trace id.
         """
-        if not self.enabled or not trace_id:
+        if not trace_id or self._get_client() is None:
             return None
         try:
-            return CallbackHandler(
-                trace_context=TraceContext(trace_id=str(trace_id)),
+            return self._CallbackHandler(
+                trace_context=self._TraceContext(trace_id=str(trace_id)),
                 update_trace=bool(update_trace),
             )
         except Exception as e:
@@ -134,9 +183,9 @@ class LangfuseConfig:
     
     def flush(self):
         """Flush any pending traces."""
-        if self._callback_handler:
+        if self._client is not None:
             try:
-                self._callback_handler.flush()
+                self._client.flush()
             except Exception as e:
                 logger.error(f"Error flushing Langfuse traces: {e}")
 
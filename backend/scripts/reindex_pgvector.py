@@ -15,9 +15,10 @@ Usage:
 
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from app.core.config import settings
 from app.db.session import SessionLocal
@@ -109,33 +110,46 @@ def _resolve_project_root(project_id: int, project_uuid: str) -> Optional[Path]:
     return None
 
 
-def _scan_project_files(project_root: Path) -> List[Dict]:
-    out: List[Dict] = []
-    for file_path in project_root.rglob("*"):
-        if not file_path.is_file():
+def _walk_code_files(root: str) -> Iterator[os.DirEntry]:
+    """
+    Yield code file entries under root, pruning skipped directories before descending
+    (rather than walking node_modules/.venv and filtering afterwards).
+    """
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError:
             continue
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        if e.name not in SKIP_DIR_NAMES:
+                            stack.append(e.path)
+                    elif e.is_file():
+                        ext = os.path.splitext(e.name)[1].lower()
+                        if ext in CODE_EXTENSIONS and ext not in SKIP_EXTENSIONS:
+                            yield e
+                except OSError:
+                    continue
 
-        # Skip if in ignored directories
-        if any(part in SKIP_DIR_NAMES for part in file_path.parts):
-            continue
-
-        ext = file_path.suffix.lower()
-        if ext in SKIP_EXTENSIONS:
-            continue
-        if ext not in CODE_EXTENSIONS:
-            continue
 
+def _scan_project_files(project_root: Path) -> List[Dict]:
+    out: List[Dict] = []
+    root = str(project_root)
+    for e in _walk_code_files(root):
         try:
-            size = file_path.stat().st_size
+            size = e.stat().st_size
         except Exception:
             size = 0
 
-        rel_path = file_path.relative_to(project_root)
         out.append(
             {
-                "path": str(rel_path),
-                "absolute_path": str(file_path),
-                "ext": ext,
+                "path": os.path.relpath(e.path, root),
+                "absolute_path": e.path,
+                "ext": os.path.splitext(e.name)[1].lower(),
                 "size": size,
             }
         )
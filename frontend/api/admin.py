@@ -2,11 +2,12 @@
 Admin API client.
 """
 
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 import streamlit as st
 
-from api.client import get_client, handle_http_error
+from api.client import get_client, handle_http_error, response_json
 from core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -17,18 +18,65 @@ def admin_get_analytics() -> Optional[Dict]:
         with get_client() as client:
             resp = client.get("/admin/analytics")
             resp.raise_for_status()
-            return resp.json()
+            return response_json(resp)
     except Exception as e:
         logger.error(handle_http_error(e, "Admin analytics", logger))
         return None
 
 
+def admin_get_overview() -> Tuple[Optional[Dict], List[Dict], List[Dict]]:
+    """
+    Fetch analytics, users and projects for the admin page concurrently over the
+    shared client. Returns (analytics, users, projects) with the same fallbacks as
+    the individual getters.
+    """
+    # Build the client here: it reads the auth token from session_state, which is
+    # only available on the script thread.
+    client = get_client()
+
+    def fetch(path: str):
+        resp = client.get(path)
+        resp.raise_for_status()
+        return response_json(resp)
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        futures = {
+            "analytics": ex.submit(fetch, "/admin/analytics"),
+            "projects": ex.submit(fetch, "/admin/projects"),
+        }
+        # Users go through the short-lived cache (cleared by the user mutations); it is
+        # read on the script thread, since a cache miss builds a client from session_state.
+        users = admin_list_users()
+    results: Dict[str, object] = {"users": users}
+    for name, op, fallback in (
+        ("analytics", "Admin analytics", None),
+        ("projects", "Admin list projects", []),
+    ):
+        try:
+            results[name] = futures[name].result()
+        except Exception as e:
+            logger.error(handle_http_error(e, op, logger))
+            results[name] = fallback
+    return results["analytics"], results["users"], results["projects"]
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_admin_list_users(token: str) -> List[Dict]:
+    # Cached briefly per auth token; errors raise and are not cached.
+    with get_client() as client:
+        resp = client.get("/admin/users")
+        resp.raise_for_status()
+        return response_json(resp)
+
+
+def invalidate_admin_users_cache() -> None:
+    """Drop cached user lists (call after creating, updating or deleting a user)."""
+    _cached_admin_list_users.clear()
+
+
 def admin_list_users() -> List[Dict]:
     try:
-        with get_client() as client:
-            resp = client.get("/admin/users")
-            resp.raise_for_status()
-            return resp.json()
+        return _cached_admin_list_users(st.session_state.get("token") or "")
     except Exception as e:
         logger.error(handle_http_error(e, "Admin list users", logger))
         return []
@@ -39,7 +87,8 @@ def admin_create_user(email: str, password: str, role: str = "user") -> Optional
         with get_client() as client:
             resp = client.post("/admin/users", json={"email": email, "password": password, "role": role})
             resp.raise_for_status()
-            return resp.json()
+            invalidate_admin_users_cache()
+            return response_json(resp)
     except Exception as e:
         logger.error(handle_http_error(e, "Admin create user", logger))
         return None
@@ -53,22 +102,25 @@ def admin_update_user(
     role: Optional[str] = None,
     is_active: Optional[bool] = None,
 ) -> Optional[Dict]:
-    payload: Dict[str, object] = {}
-    if email is not None:
-        payload["email"] = email
-    if password is not None:
-        payload["password"] = password
-    if role is not None:
-        payload["role"] = role
-    if is_active is not None:
-        payload["is_active"] = bool(is_active)
+    # Only send the fields being changed; PATCH makes the partial update explicit.
+    payload: Dict[str, object] = {
+        k: v
+        for k, v in (
+            ("email", email),
+            ("password", password),
+            ("role", role),
+            ("is_active", bool(is_active) if is_active is not None else None),
+        )
+        if v is not None
+    }
     if not payload:
         return None
     try:
         with get_client() as client:
-            resp = client.put(f"/admin/users/{int(user_id)}", json=payload)
+            resp = client.patch(f"/admin/users/{int(user_id)}", json=payload)
             resp.raise_for_status()
-            return resp.json()
+            invalidate_admin_users_cache()
+            return response_json(resp)
     except Exception as e:
         logger.error(handle_http_error(e, "Admin update user", logger))
         return None
@@ -79,6 +131,7 @@ def admin_delete_user(user_id: int) -> bool:
         with get_client() as client:
             resp = client.delete(f"/admin/users/{int(user_id)}")
             resp.raise_for_status()
+            invalidate_admin_users_cache()
             return True
     except Exception as e:
         logger.error(handle_http_error(e, "Admin delete user", logger))
@@ -90,7 +143,7 @@ def admin_list_projects() -> List[Dict]:
         with get_client() as client:
             resp = client.get("/admin/projects")
             resp.raise_for_status()
-            return resp.json()
+            return response_json(resp)
     except Exception as e:
         logger.error(handle_http_error(e, "Admin list projects", logger))
         return []
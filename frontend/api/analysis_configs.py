@@ -3,18 +3,53 @@ API client for analysis configurations (Milestone 4).
 """
 from typing import Dict, List, Optional
 
-from api.client import get_client, handle_http_error
+import streamlit as st
+
+from api.client import get_client, handle_http_error, response_json
 from core.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_get_analysis_configs(token: str) -> List[Dict]:
+    # Cached briefly per auth token; errors are raised (and thus not cached).
+    with get_client() as client:
+        resp = client.get("/analysis-configs/")
+        resp.raise_for_status()
+        return response_json(resp)
+
+
+def invalidate_analysis_configs_cache() -> None:
+    """Drop cached configuration lists (call after updating or deleting a configuration)."""
+    _cached_get_analysis_configs.clear()
+    st.session_state.pop("created_analysis_configs", None)
+
+
+def _with_created(configs: List[Dict], created: List[Dict]) -> List[Dict]:
+    """
+    Merge configurations created since the list was cached, in the backend's order
+    (default first, then newest first). A new default clears the old one's flag.
+    """
+    merged = list(configs)
+    known = {c.get("id") for c in configs}
+    for cfg in created:
+        # Already in a list fetched after it was created (the cache expired).
+        if cfg.get("id") in known:
+            continue
+        if cfg.get("is_default"):
+            merged = [{**c, "is_default": False} if c.get("is_default") else c for c in merged]
+            merged.insert(0, cfg)
+        else:
+            merged.insert(sum(1 for c in merged if c.get("is_default")), cfg)
+    return merged
+
+
 def get_analysis_configs() -> List[Dict]:
     try:
-        with get_client() as client:
-            resp = client.get("/analysis-configs/")
-            resp.raise_for_status()
-            return resp.json()
+        configs = _cached_get_analysis_configs(st.session_state.get("token") or "")
+        created = st.session_state.get("created_analysis_configs")
+        return _with_created(configs, created) if created else configs
     except Exception as e:
         logger.error(handle_http_error(e, "Get analysis configurations", logger))
         return []
@@ -25,7 +60,7 @@ def get_default_config() -> Optional[Dict]:
         with get_client() as client:
             resp = client.get("/analysis-configs/default")
             resp.raise_for_status()
-            return resp.json()
+            return response_json(resp)
     except Exception as e:
         logger.error(handle_http_error(e, "Get default configuration", logger))
         return None
@@ -36,7 +71,9 @@ def update_analysis_config(config_id: int, config_data: Dict) -> Optional[Dict]:
         with get_client() as client:
             resp = client.put(f"/analysis-configs/{config_id}", json=config_data)
             resp.raise_for_status()
-            return resp.json()
+            updated = response_json(resp)
+        invalidate_analysis_configs_cache()
+        return updated
     except Exception as e:
         logger.error(handle_http_error(e, "Update analysis configuration", logger))
         return None
@@ -47,7 +84,10 @@ def create_analysis_config(config_data: Dict) -> Optional[Dict]:
         with get_client() as client:
             resp = client.post("/analysis-configs/", json=config_data)
             resp.raise_for_status()
-            return resp.json()
+            created = response_json(resp)
+        # Shown by merging into the cached list rather than refetching it.
+        st.session_state.setdefault("created_analysis_configs", []).append(created)
+        return created
     except Exception as e:
         logger.error(handle_http_error(e, "Create analysis configuration", logger))
         return None
@@ -58,7 +98,8 @@ def delete_analysis_config(config_id: int) -> bool:
         with get_client() as client:
             resp = client.delete(f"/analysis-configs/{config_id}")
             resp.raise_for_status()
-            return True
+        invalidate_analysis_configs_cache()
+        return True
     except Exception as e:
         logger.error(handle_http_error(e, "Delete analysis configuration", logger))
         return False
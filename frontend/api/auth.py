@@ -2,11 +2,10 @@
 Authentication API endpoints.
 """
 import streamlit as st
-import httpx
 from core.logging import get_logger
 from core.auth import set_auth_state, clear_auth_state
-from api.client import handle_http_error
-from config.settings import settings
+from core.session import current_email
+from api.client import get_public_client, handle_http_error, response_json
 
 logger = get_logger(__name__)
 
@@ -21,11 +20,12 @@ def register_user(email: str, password: str):
     """
     logger.info(f"Registration attempt for email: {email}")
     try:
-        response = httpx.post(
-            f"{settings.FASTAPI_URL}/signup",
-            json={"email": email, "password": password}
-        )
-        response.raise_for_status()
+        with get_public_client() as client:
+            response = client.post(
+                "/signup",
+                json={"email": email, "password": password}
+            )
+            response.raise_for_status()
         logger.info(f"Registration successful for email: {email}")
         st.success("Registration successful! Please login.")
     except Exception as e:
@@ -43,24 +43,26 @@ def login_user(email: str, password: str):
     """
     logger.info(f"Login attempt for email: {email}")
     try:
-        response = httpx.post(
-            f"{settings.FASTAPI_URL}/token",
+        client = get_public_client()
+        response = client.post(
+            "/token",
             data={"username": email, "password": password}
         )
         response.raise_for_status()
-        token_data = response.json()
+        token_data = response_json(response)
         token = token_data["access_token"]
 
-        # Backend /token does not return role; fetch it from /users/me using the token.
+        # Backend /token does not return role; fetch it from /users/me using the token
+        # (same pooled connection as the /token call).
         role = "user"
         try:
-            me = httpx.get(
-                f"{settings.FASTAPI_URL}/users/me",
+            me = client.get(
+                "/users/me",
                 headers={"Authorization": f"Bearer {token}"},
                 timeout=10.0,
             )
             me.raise_for_status()
-            role = (me.json() or {}).get("role", "user")
+            role = (response_json(me) or {}).get("role", "user")
         except Exception as e:
             logger.warning(f"Failed to fetch /users/me after login: {e}")
 
@@ -75,7 +77,7 @@ def login_user(email: str, password: str):
 
 def logout_user():
     """Logout user and clear authentication state"""
-    email = st.session_state.get("email", "unknown")
+    email = current_email()
     logger.info(f"User logged out: {email}")
     clear_auth_state()
     st.success("Logged out successfully.")
@@ -1,10 +1,13 @@
 """
 Chat API endpoints.
 """
+import logging
+
 import streamlit as st
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from core.logging import get_logger
-from api.client import get_client, handle_http_error
+from core.session import current_email
+from api.client import get_client, handle_http_error, response_json, json_loads
 
 logger = get_logger(__name__)
 
@@ -20,8 +23,9 @@ def create_chat_session(project_id: int, title: str = "New Chat") -> Optional[Di
     Returns:
         Session dictionary or None
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.info(f"Creating chat session | project: {project_id} | user: {user_email}")
+    if logger.isEnabledFor(logging.INFO):
+        user_email = current_email()
+        logger.info(f"Creating chat session | project: {project_id} | user: {user_email}")
     try:
         with get_client() as client:
             response = client.post(
@@ -29,7 +33,8 @@ def create_chat_session(project_id: int, title: str = "New Chat") -> Optional[Di
                 json={"project_id": project_id, "title": title}
             )
             response.raise_for_status()
-            session = response.json()
+            session = response_json(response)
+        invalidate_chat_sessions_cache()
         logger.info(f"Chat session created | session_id: {session['id']}")
         return session
     except Exception as e:
@@ -38,6 +43,31 @@ def create_chat_session(project_id: int, title: str = "New Chat") -> Optional[Di
         return None
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_get_chat_sessions(token: str, project_id: int) -> List[Dict]:
+    """
+    Fetch a project's chat sessions, cached briefly per auth token and project;
+    errors are raised (and thus not cached).
+    """
+    with get_client() as client:
+        response = client.get(f"/chat/projects/{project_id}/sessions")
+        response.raise_for_status()
+        sessions = response_json(response)
+    # Shortened title for the session buttons, computed once per fetch instead of
+    # on every rerun.
+    for session in sessions:
+        title = session.get('title') or ""
+        session['display_title'] = title[:30] + "..." if len(title) > 30 else title
+    logger.info(f"Retrieved {len(sessions)} chat sessions")
+    return sessions
+
+
+def invalidate_chat_sessions_cache() -> None:
+    """Drop cached session lists (call after creating or messaging a session)."""
+    _cached_get_chat_sessions.clear()
+    st.session_state.pop("deleted_chat_sessions", None)
+
+
 def get_chat_sessions(project_id: int) -> List[Dict]:
     """
     Get all chat sessions for a project.
@@ -48,14 +78,15 @@ def get_chat_sessions(project_id: int) -> List[Dict]:
     Returns:
         List of session dictionaries
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.debug(f"Fetching chat sessions | project: {project_id} | user: {user_email}")
+    if logger.isEnabledFor(logging.DEBUG):
+        user_email = current_email()
+        logger.debug(f"Fetching chat sessions | project: {project_id} | user: {user_email}")
     try:
-        with get_client() as client:
-            response = client.get(f"/chat/projects/{project_id}/sessions")
-            response.raise_for_status()
-            sessions = response.json()
-        logger.info(f"Retrieved {len(sessions)} chat sessions")
+        sessions = _cached_get_chat_sessions(st.session_state.get("token") or "", project_id)
+        # Deletions are applied locally instead of refetching the list.
+        deleted = st.session_state.get("deleted_chat_sessions")
+        if deleted:
+            sessions = [s for s in sessions if s["id"] not in deleted]
         return sessions
     except Exception as e:
         logger.error(f"Error fetching chat sessions: {e}", exc_info=True)
@@ -72,18 +103,47 @@ def get_chat_session(session_id: int) -> Optional[Dict]:
     Returns:
         Session dictionary or None
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.debug(f"Fetching chat session | session_id: {session_id} | user: {user_email}")
+    if logger.isEnabledFor(logging.DEBUG):
+        user_email = current_email()
+        logger.debug(f"Fetching chat session | session_id: {session_id} | user: {user_email}")
     try:
         with get_client() as client:
             response = client.get(f"/chat/sessions/{session_id}")
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
     except Exception as e:
         logger.error(f"Error fetching chat session: {e}", exc_info=True)
         return None
 
 
+def get_chat_messages(session_id: int, limit: int = 50, offset: int = 0) -> Optional[List[Dict]]:
+    """
+    Get a page of a session's messages (oldest first).
+    
+    Args:
+        session_id: Session ID
+        limit: Maximum number of messages
+        offset: Number of newest messages to skip (how many the caller already holds)
+    
+    Returns:
+        List of message dictionaries or None
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        user_email = current_email()
+        logger.debug(f"Fetching chat messages | session_id: {session_id} | offset: {offset} | user: {user_email}")
+    try:
+        with get_client() as client:
+            response = client.get(
+                f"/chat/sessions/{session_id}/messages",
+                params={"limit": limit, "offset": offset}
+            )
+            response.raise_for_status()
+            return response_json(response)
+    except Exception as e:
+        logger.error(f"Error fetching chat messages: {e}", exc_info=True)
+        return None
+
+
 def send_chat_message(session_id: int, message: str, config_id: Optional[int] = None) -> Optional[Dict]:
     """
     Send a message in a chat session.
@@ -96,8 +156,9 @@ def send_chat_message(session_id: int, message: str, config_id: Optional[int] =
     Returns:
         Response dictionary or None
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.info(f"Sending chat message | session_id: {session_id} | user: {user_email}")
+    if logger.isEnabledFor(logging.INFO):
+        user_email = current_email()
+        logger.info(f"Sending chat message | session_id: {session_id} | user: {user_email}")
     try:
         with get_client(timeout=200.0) as client:
             payload: Dict[str, object] = {"message": message}
@@ -108,7 +169,9 @@ def send_chat_message(session_id: int, message: str, config_id: Optional[int] =
                 json=payload
             )
             response.raise_for_status()
-            result = response.json()
+            result = response_json(response)
+        # The first message renames the session and every message reorders the list.
+        invalidate_chat_sessions_cache()
         logger.info(f"Chat message sent successfully")
         return result
     except Exception as e:
@@ -117,6 +180,94 @@ def send_chat_message(session_id: int, message: str, config_id: Optional[int] =
         return None
 
 
+def _stream_route_missing(response) -> bool:
+    """
+    True when a 404 from the streaming endpoint is not the backend's "session not
+    found", i.e. the route itself is missing. The body may not be JSON (e.g. an HTML
+    404 from a reverse proxy in front of an older backend).
+    """
+    detail = None
+    if "json" in response.headers.get("content-type", ""):
+        try:
+            body = response_json(response)
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            detail = body.get("detail")
+    return detail != "Chat session not found"
+
+
+def stream_chat_message(
+    session_id: int,
+    message: str,
+    config_id: Optional[int] = None,
+    result: Optional[Dict] = None,
+) -> Iterator[str]:
+    """
+    Send a message and yield the answer text as it is generated (for `st.write_stream`).
+
+    Falls back to `send_chat_message` when the backend has no streaming endpoint.
+    
+    Args:
+        session_id: Session ID
+        message: Message content
+        config_id: Optional analysis configuration ID to apply for this chat turn
+        result: Optional dict; receives the final response under "response"
+    
+    Yields:
+        Fragments of the assistant answer
+    """
+    if logger.isEnabledFor(logging.INFO):
+        user_email = current_email()
+        logger.info(f"Streaming chat message | session_id: {session_id} | user: {user_email}")
+    payload: Dict[str, object] = {"message": message}
+    if config_id is not None:
+        payload["config_id"] = int(config_id)
+
+    streamed: List[str] = []
+    response_data: Optional[Dict] = None
+    try:
+        with get_client(timeout=200.0) as client:
+            with client.stream("POST", f"/chat/sessions/{session_id}/messages/stream", json=payload) as response:
+                if response.status_code >= 400:
+                    response.read()
+                    # A 404 for the route itself (not for the session) means an older backend.
+                    if response.status_code == 404 and _stream_route_missing(response):
+                        logger.info("Streaming endpoint unavailable; falling back to non-streaming chat")
+                        response_data = send_chat_message(session_id, message, config_id=config_id)
+                        if response_data:
+                            yield response_data["message"]["content"]
+                        return
+                    response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    event = json_loads(line[6:])
+                    kind = event.get("type")
+                    if kind == "token":
+                        streamed.append(event["content"])
+                        yield event["content"]
+                    elif kind == "done":
+                        response_data = event
+                        # The saved answer may extend the streamed synthesis (persona sections).
+                        text = "".join(streamed)
+                        content = event["message"]["content"]
+                        if content.startswith(text) and len(content) > len(text):
+                            yield content[len(text):]
+                    elif kind == "error":
+                        logger.error(f"Send chat message failed: {event.get('detail')}")
+                        st.error(f"Send chat message failed: {event.get('detail')}")
+        if response_data:
+            invalidate_chat_sessions_cache()
+            logger.info("Chat message streamed successfully")
+    except Exception as e:
+        error_msg = handle_http_error(e, "Send chat message", logger)
+        st.error(error_msg)
+    finally:
+        if result is not None:
+            result["response"] = response_data
+
+
 def delete_chat_session(session_id: int) -> bool:
     """
     Delete a chat session.
@@ -127,12 +278,15 @@ def delete_chat_session(session_id: int) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.info(f"Deleting chat session | session_id: {session_id} | user: {user_email}")
+    if logger.isEnabledFor(logging.INFO):
+        user_email = current_email()
+        logger.info(f"Deleting chat session | session_id: {session_id} | user: {user_email}")
     try:
         with get_client() as client:
             response = client.delete(f"/chat/sessions/{session_id}")
             response.raise_for_status()
+        # Hide it from the cached list rather than refetching after the rerun.
+        st.session_state.setdefault("deleted_chat_sessions", set()).add(session_id)
         logger.info(f"Chat session deleted successfully")
         return True
     except Exception as e:
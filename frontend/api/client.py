@@ -1,45 +1,192 @@
 """
 HTTP client configuration and utilities.
 """
+import json
+import logging
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Union
+
 import httpx
+import streamlit as st
 from config.settings import settings
-from core.auth import get_auth_headers
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional: stdlib json is used when orjson is not installed
+    orjson = None
+
+# Longest error detail shown to the user / written to the error log.
+_MAX_ERROR_DETAIL_CHARS = 500
+
+# Project uploads may take minutes to send and process, but an unreachable backend
+# should still fail fast instead of holding the request for the full timeout.
+UPLOAD_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+
+@st.cache_resource
+def _shared_client() -> httpx.Client:
+    """
+    Process-wide pooled HTTP client.
+
+    Shared by every Streamlit session so keep-alive connections (and their TCP/TLS
+    handshakes) are reused across API calls. HTTP/2 is negotiated when the backend is
+    served over TLS (e.g. behind a proxy), multiplexing concurrent requests on one
+    connection; plain-HTTP backends keep using HTTP/1.1. Holds no auth state:
+    per-user headers are added per request by `ApiClient`.
+    """
+    # Limits and HTTP/2 live on the transport; retries only cover failed connection
+    # attempts (nothing was sent), so they are safe for POST/PATCH as well.
+    transport = httpx.HTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=60.0),
+        retries=2,
+    )
+    return httpx.Client(
+        base_url=settings.FASTAPI_URL,
+        transport=transport,
+        timeout=httpx.Timeout(60.0),
+    )
+
+
+@lru_cache(maxsize=256)
+def _headers_for_token(token: Optional[str]) -> Mapping[str, str]:
+    """
+    Auth headers for a session token, memoized so the header dict is only rebuilt
+    when the token changes (login/logout) rather than on every API call.
+    """
+    if token:
+        return MappingProxyType({"Authorization": f"Bearer {token}"})
+    return MappingProxyType({})
 
-def get_client(timeout: float = 60.0):
+
+class ApiClient:
+    """
+    Per-call view of the shared client that applies the current session's auth
+    headers and the caller's timeout to every request.
+
+    Supports `with get_client() as client:`; leaving the block does not close the
+    shared connection pool.
+    """
+
+    def __init__(self, timeout: Union[float, httpx.Timeout] = 60.0, authenticated: bool = True):
+        self._client = _shared_client()
+        token = st.session_state.get("token") if authenticated else None
+        self._headers = _headers_for_token(token)
+        self._timeout = httpx.Timeout(timeout)
+
+    def _merge(self, kwargs: dict) -> dict:
+        headers = dict(self._headers)
+        headers.update(kwargs.pop("headers", None) or {})
+        kwargs["headers"] = headers
+        kwargs.setdefault("timeout", self._timeout)
+        return kwargs
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return self._client.request(method, url, **self._merge(kwargs))
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def stream(self, method: str, url: str, **kwargs):
+        return self._client.stream(method, url, **self._merge(kwargs))
+
+    def __enter__(self) -> "ApiClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON with orjson when available (several times faster than stdlib json)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> str:
+    """Encode JSON to str with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def response_json(response: httpx.Response) -> Any:
+    """Decode a response body; drop-in for `response.json()`."""
+    return json_loads(response.content)
+
+
+def get_client(timeout: Union[float, httpx.Timeout] = 60.0) -> ApiClient:
     """
     Get configured HTTP client with auth headers.
-    
+
+    Args:
+        timeout: Request timeout in seconds, or an `httpx.Timeout`
+
+    Returns:
+        ApiClient bound to the shared connection pool
+    """
+    return ApiClient(timeout=timeout)
+
+
+def get_public_client(timeout: float = 30.0) -> ApiClient:
+    """
+    Get an HTTP client for unauthenticated endpoints (signup, token).
+
+    Uses the same connection pool as `get_client`, so the connection opened for
+    login is reused by the authenticated calls that follow.
+
     Args:
         timeout: Request timeout in seconds
-    
+
     Returns:
-        httpx.Client instance
+        ApiClient bound to the shared connection pool, without auth headers
     """
-    return httpx.Client(
-        base_url=settings.FASTAPI_URL,
-        headers=get_auth_headers(),
-        timeout=httpx.Timeout(timeout)
-    )
+    return ApiClient(timeout=timeout, authenticated=False)
 
 
 def handle_http_error(e: Exception, operation: str, logger):
     """
     Handle HTTP errors and return user-friendly message.
-    
+
     Args:
         e: Exception that occurred
         operation: Description of the operation
         logger: Logger instance
-    
+
     Returns:
         Error message string
     """
     if isinstance(e, httpx.HTTPStatusError):
-        try:
-            error_detail = e.response.json().get('detail', 'Unknown error')
-        except:
-            error_detail = e.response.text or 'Unknown error'
+        # Only attempt JSON decoding when the server says it sent JSON; HTML/text
+        # error pages (proxies, 502s) go straight to the truncated text body.
+        content_type = e.response.headers.get("content-type", "")
+        error_detail = None
+        if "application/json" in content_type:
+            try:
+                error_detail = e.response.json().get('detail', 'Unknown error')
+            except Exception:
+                error_detail = None
+        if error_detail is None:
+            body = e.response.text or ""
+            if body and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{operation} error body: {body}")
+            error_detail = body or 'Unknown error'
+        if isinstance(error_detail, str):
+            error_detail = error_detail[:_MAX_ERROR_DETAIL_CHARS]
         logger.error(f"{operation} failed: {error_detail}")
         # Normalize FastAPI/Pydantic validation errors into user-friendly text.
         if isinstance(error_detail, list):
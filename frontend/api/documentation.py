@@ -6,8 +6,9 @@ from typing import Dict, List, Optional
 
 import streamlit as st
 
-from api.client import get_client, handle_http_error
+from api.client import get_client, handle_http_error, response_json
 from core.logging import get_logger
+from core.session import current_email
 
 logger = get_logger(__name__)
 
@@ -18,7 +19,7 @@ def generate_project_documentation(
     config_id: Optional[int] = None,
     persona_mode: str = "both",
 ) -> Optional[Dict]:
-    user_email = st.session_state.get("email", "unknown")
+    user_email = current_email()
     logger.info(
         f"Generate documentation | project={project_id} | config_id={config_id} | persona={persona_mode} | user={user_email}"
     )
@@ -29,18 +30,31 @@ def generate_project_documentation(
         with get_client(timeout=180.0) as client:
             resp = client.post(f"/documentation/projects/{int(project_id)}/generate", json=payload)
             resp.raise_for_status()
-            return resp.json()
+            doc = response_json(resp)
+        invalidate_documentations_cache()
+        return doc
     except Exception as e:
         logger.error(handle_http_error(e, "Generate documentation", logger))
         return None
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_list_project_documentations(token: str, project_id: int) -> List[Dict]:
+    # Cached briefly per auth token and project; errors are raised (and thus not cached).
+    with get_client() as client:
+        resp = client.get(f"/documentation/projects/{int(project_id)}")
+        resp.raise_for_status()
+        return response_json(resp)
+
+
+def invalidate_documentations_cache() -> None:
+    """Drop cached documentation lists (call after generating or deleting one)."""
+    _cached_list_project_documentations.clear()
+
+
 def list_project_documentations(project_id: int) -> List[Dict]:
     try:
-        with get_client() as client:
-            resp = client.get(f"/documentation/projects/{int(project_id)}")
-            resp.raise_for_status()
-            return resp.json()
+        return _cached_list_project_documentations(st.session_state.get("token") or "", int(project_id))
     except Exception as e:
         logger.error(handle_http_error(e, "List documentations", logger))
         return []
@@ -51,7 +65,7 @@ def get_documentation(doc_id: int) -> Optional[Dict]:
         with get_client() as client:
             resp = client.get(f"/documentation/{int(doc_id)}")
             resp.raise_for_status()
-            return resp.json()
+            return response_json(resp)
     except Exception as e:
         logger.error(handle_http_error(e, "Get documentation", logger))
         return None
@@ -62,7 +76,8 @@ def delete_documentation(doc_id: int) -> bool:
         with get_client() as client:
             resp = client.delete(f"/documentation/{int(doc_id)}")
             resp.raise_for_status()
-            return True
+        invalidate_documentations_cache()
+        return True
     except Exception as e:
         logger.error(handle_http_error(e, "Delete documentation", logger))
         return False
@@ -2,15 +2,31 @@
 Project management API endpoints.
 """
 import streamlit as st
-import json
 import re
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Optional, Tuple
 from core.logging import get_logger
-from api.client import get_client, handle_http_error
+from core.session import current_email
+from api.client import UPLOAD_TIMEOUT, get_client, handle_http_error, response_json, json_dumps
 from config.settings import settings
 
 logger = get_logger(__name__)
 
+# Repository root URLs only (optionally ending in "/" or ".git"): the backend clones
+# the URL as-is, so deeper paths such as /tree/<branch> cannot be cloned.
+_GITHUB_URL_RE = re.compile(r"https://github\.com/[^/\s]+/[^/\s]+/?")
+
+
+def upload_part(uploaded_file) -> Tuple[str, BinaryIO, str]:
+    """
+    Multipart file tuple for a Streamlit UploadedFile.
+
+    Passes the file object itself (rewound) rather than `getvalue()`: httpx streams
+    file objects in chunks, so the upload is never copied into a second bytes buffer.
+    """
+    uploaded_file.seek(0)
+    return (uploaded_file.name, uploaded_file, uploaded_file.type)
+
 
 def create_project(title: str, description: str, personas: List[str], zip_file=None, github_url: str = None):
     """
@@ -23,48 +39,124 @@ def create_project(title: str, description: str, personas: List[str], zip_file=N
         zip_file: Uploaded ZIP file
         github_url: GitHub repository URL
     """
-    user_email = st.session_state.get("email", "unknown")
+    user_email = current_email()
     source_type = "ZIP" if zip_file else "GitHub URL" if github_url else "none"
-    logger.info(f"Project creation started | user: {user_email} | title: {title} | source: {source_type}")
+    logger.info("Project creation started | user: %s | title: %s | source: %s", user_email, title, source_type)
     
     files = {}
     data = {
         "title": title,
         "description": description,
-        "personas": json.dumps(personas)
+        "personas": json_dumps(personas)
     }
 
     if zip_file:
         file_size_mb = zip_file.size / (1024 * 1024)
-        logger.debug(f"ZIP file selected: {zip_file.name} | size: {file_size_mb:.2f}MB")
+        logger.debug("ZIP file selected: %s | size: %.2fMB", zip_file.name, file_size_mb)
         
         if zip_file.size > settings.MAX_FILE_SIZE:
-            logger.warning(f"ZIP file too large: {file_size_mb:.2f}MB | user: {user_email}")
+            logger.warning("ZIP file too large: %.2fMB | user: %s", file_size_mb, user_email)
             st.error(f"File too large. Max size is {settings.MAX_FILE_SIZE / (1024 * 1024)} MB.")
             return
-        files = {"zip_file": (zip_file.name, zip_file.getvalue(), zip_file.type)}
+        files = {"zip_file": upload_part(zip_file)}
     elif github_url:
-        logger.debug(f"GitHub URL provided: {github_url}")
+        logger.debug("GitHub URL provided: %s", github_url)
         
-        if not re.match(r"https://github.com/[^/]+/[^/]+", github_url):
-            logger.warning(f"Invalid GitHub URL format: {github_url} | user: {user_email}")
+        if not _GITHUB_URL_RE.fullmatch(github_url):
+            logger.warning("Invalid GitHub URL format: %s | user: %s", github_url, user_email)
             st.error("Invalid GitHub URL format.")
             return
         data["github_url"] = github_url
 
     try:
         with st.spinner("Creating project... This may take up to 2 minutes for large files or GitHub repositories."):
-            with get_client(timeout=600.0) as client:
-                logger.info(f"Sending project creation request to backend | user: {user_email}")
+            with get_client(timeout=UPLOAD_TIMEOUT) as client:
+                logger.info("Sending project creation request to backend | user: %s", user_email)
                 response = client.post("/projects/", data=data, files=files)
                 response.raise_for_status()
-        logger.info(f"Project created successfully | user: {user_email} | title: {title}")
+        invalidate_projects_cache()
+        logger.info("Project created successfully | user: %s | title: %s", user_email, title)
         st.success("Project created successfully!")
     except Exception as e:
         error_msg = handle_http_error(e, "Project creation", logger)
         st.error(error_msg)
 
 
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_get_projects(token: str) -> List[Dict]:
+    """
+    Fetch the project list. Cached briefly per auth token so the reruns triggered by
+    every widget interaction reuse the last response; errors are raised (and thus
+    not cached).
+    """
+    with get_client() as client:
+        response = client.get("/projects/")
+        response.raise_for_status()
+        projects = response_json(response)
+    # Normalized once per fetch (e.g. ["SDE", "PM"] -> {"sde", "pm"}) for the pages
+    # that pick a persona mode.
+    for project in projects:
+        project["persona_set"] = frozenset(
+            str(x).strip().lower() for x in (project.get("personas") or []) if str(x).strip()
+        )
+    logger.info("Retrieved %s projects", len(projects))
+    return projects
+
+
+@dataclass(slots=True)
+class ProjectView:
+    """The project fields the projects tab renders (built once per fetch)."""
+    id: int
+    title: str
+    status: str
+    description: Optional[str]
+    repository_type: Optional[str]
+    framework: Optional[str]
+    total_files: int
+    total_lines_of_code: int
+    api_endpoints_count: int
+    models_count: int
+    languages_breakdown: Dict
+    entry_points: List[str]
+    dependencies: List[str]
+    source_type: str
+    source_value: str
+    personas: List[str]
+
+    @classmethod
+    def from_dict(cls, project: Dict) -> "ProjectView":
+        return cls(
+            id=project['id'],
+            title=project['title'],
+            status=project.get('preprocessing_status', 'pending'),
+            description=project.get('description'),
+            repository_type=project.get('repository_type'),
+            framework=project.get('framework', 'None detected'),
+            total_files=project.get('total_files', 0),
+            total_lines_of_code=project.get('total_lines_of_code', 0),
+            api_endpoints_count=project.get('api_endpoints_count', 0),
+            models_count=project.get('models_count', 0),
+            languages_breakdown=project.get('languages_breakdown', {}),
+            entry_points=project.get('entry_points', []),
+            dependencies=project.get('dependencies', []),
+            source_type=project.get('source_type', 'Unknown'),
+            source_value=project.get('source_value', 'N/A'),
+            personas=project.get('personas', []),
+        )
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_get_project_views(token: str) -> List[ProjectView]:
+    # Converted once per fetch of the (cached) project list.
+    return [ProjectView.from_dict(p) for p in _cached_get_projects(token)]
+
+
+def invalidate_projects_cache() -> None:
+    """Drop cached project lists (call after creating or deleting a project)."""
+    _cached_get_projects.clear()
+    _cached_get_project_views.clear()
+
+
 def get_projects() -> List[Dict]:
     """
     Get all projects for current user.
@@ -72,15 +164,25 @@ def get_projects() -> List[Dict]:
     Returns:
         List of project dictionaries
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.debug(f"Fetching projects for user: {user_email}")
+    user_email = current_email()
+    logger.debug("Fetching projects for user: %s", user_email)
     try:
-        with get_client() as client:
-            response = client.get("/projects/")
-            response.raise_for_status()
-            projects = response.json()
-        logger.info(f"Retrieved {len(projects)} projects for user: {user_email}")
-        return projects
+        return _cached_get_projects(st.session_state.get("token") or "")
+    except Exception as e:
+        error_msg = handle_http_error(e, "Fetch projects", logger)
+        st.error(error_msg)
+    return []
+
+
+def get_project_views() -> List[ProjectView]:
+    """
+    Get all projects for current user as `ProjectView`s (for the projects tab).
+    
+    Returns:
+        List of project views
+    """
+    try:
+        return _cached_get_project_views(st.session_state.get("token") or "")
     except Exception as e:
         error_msg = handle_http_error(e, "Fetch projects", logger)
         st.error(error_msg)
@@ -97,13 +199,15 @@ def delete_project(project_id: int) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.info(f"Deleting project | project: {project_id} | user: {user_email}")
+    user_email = current_email()
+    logger.info("Deleting project | project: %s | user: %s", project_id, user_email)
     try:
         with get_client(timeout=30.0) as client:
             response = client.delete(f"/projects/{project_id}")
             response.raise_for_status()
-        logger.info(f"Project {project_id} deleted successfully")
+        invalidate_projects_cache()
+        _cached_get_project_analysis.clear()
+        logger.info("Project %s deleted successfully", project_id)
         return True
     except Exception as e:
         error_msg = handle_http_error(e, "Delete project", logger)
@@ -111,6 +215,18 @@ def delete_project(project_id: int) -> bool:
     return False
 
 
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_get_project_analysis(token: str, project_id: int) -> Dict:
+    """
+    Fetch a project's repository analysis, cached per auth token and project: it does
+    not change once preprocessing has completed. Errors are raised (and thus not cached).
+    """
+    with get_client() as client:
+        response = client.get(f"/projects/{project_id}/analysis")
+        response.raise_for_status()
+        return response_json(response)
+
+
 def get_project_analysis(project_id: int) -> Optional[Dict]:
     """
     Get repository intelligence analysis for a project.
@@ -121,15 +237,12 @@ def get_project_analysis(project_id: int) -> Optional[Dict]:
     Returns:
         Analysis dictionary or None
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.debug(f"Fetching analysis for project {project_id} | user: {user_email}")
+    user_email = current_email()
+    logger.debug("Fetching analysis for project %s | user: %s", project_id, user_email)
     try:
-        with get_client() as client:
-            response = client.get(f"/projects/{project_id}/analysis")
-            response.raise_for_status()
-            return response.json()
+        return _cached_get_project_analysis(st.session_state.get("token") or "", project_id)
     except Exception as e:
-        logger.error(f"Error fetching project analysis: {e}", exc_info=True)
+        logger.error("Error fetching project analysis: %s", e, exc_info=True)
         return None
 
 
@@ -141,15 +254,15 @@ def upload_file_to_project(project_id: int, uploaded_file):
         project_id: Project ID
         uploaded_file: Streamlit UploadedFile object
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.info(f"File upload initiated | project: {project_id} | file: {uploaded_file.name} | user: {user_email}")
+    user_email = current_email()
+    logger.info("File upload initiated | project: %s | file: %s | user: %s", project_id, uploaded_file.name, user_email)
     try:
         with st.spinner(f"Uploading '{uploaded_file.name}'..."):
-            files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
+            files = {"file": upload_part(uploaded_file)}
             with get_client(timeout=120.0) as client:
                 response = client.post(f"/projects/{project_id}/files/", files=files)
                 response.raise_for_status()
-        logger.info(f"File uploaded successfully | project: {project_id} | file: {uploaded_file.name} | user: {user_email}")
+        logger.info("File uploaded successfully | project: %s | file: %s | user: %s", project_id, uploaded_file.name, user_email)
         st.success(f"File '{uploaded_file.name}' uploaded successfully to project ID {project_id}!")
     except Exception as e:
         error_msg = handle_http_error(e, "File upload", logger)
@@ -4,7 +4,8 @@ Code search API endpoints.
 import streamlit as st
 from typing import Optional, Dict
 from core.logging import get_logger
-from api.client import get_client, handle_http_error
+from core.session import current_email
+from api.client import get_client, handle_http_error, response_json
 
 logger = get_logger(__name__)
 
@@ -22,8 +23,8 @@ def search_code(project_id: int, query: str, top_k: int = 10, language: Optional
     Returns:
         Search results dictionary or None
     """
-    user_email = st.session_state.get("email", "unknown")
-    logger.info(f"Code-Analyser search initiated | project: {project_id} | query: '{query}' | user: {user_email}")
+    user_email = current_email()
+    logger.info("Code-Analyser search initiated | project: %s | query: '%s' | user: %s", project_id, query, user_email)
     try:
         params = {"query": query, "top_k": top_k}
         if language:
@@ -32,10 +33,10 @@ def search_code(project_id: int, query: str, top_k: int = 10, language: Optional
         with get_client(timeout=60.0) as client:
             response = client.post(f"/projects/{project_id}/search", params=params)
             response.raise_for_status()
-            result = response.json()
+            result = response_json(response)
         
         files_analyzed = result.get('files_analyzed', 0)
-        logger.info(f"Search completed | project: {project_id} | files analyzed: {files_analyzed}")
+        logger.info("Search completed | project: %s | files analyzed: %s", project_id, files_analyzed)
         return result
     except Exception as e:
         error_msg = handle_http_error(e, "Code search", logger)
@@ -4,7 +4,8 @@ User management API endpoints (admin).
 import streamlit as st
 from typing import List, Dict
 from core.logging import get_logger
-from api.client import get_client, handle_http_error
+from core.session import current_email
+from api.client import get_client, handle_http_error, response_json
 
 logger = get_logger(__name__)
 
@@ -16,14 +17,14 @@ def get_all_users() -> List[Dict]:
     Returns:
         List of user dictionaries
     """
-    admin_email = st.session_state.get("email", "unknown")
-    logger.info(f"Admin fetching all users | admin: {admin_email}")
+    admin_email = current_email()
+    logger.info("Admin fetching all users | admin: %s", admin_email)
     try:
         with get_client() as client:
             response = client.get("/users/admin/users")
             response.raise_for_status()
-            users = response.json()
-        logger.info(f"Retrieved {len(users)} users | admin: {admin_email}")
+            users = response_json(response)
+        logger.info("Retrieved %s users | admin: %s", len(users), admin_email)
         return users
     except Exception as e:
         error_msg = handle_http_error(e, "Fetch users", logger)
@@ -1,17 +1,33 @@
 """
 HU Edge Frontend - Main Application Entry Point
 """
+import importlib
+from functools import lru_cache
+from typing import Callable
+
 import streamlit as st
 from core.logging import get_logger
 from core.session import init_session_state, is_authenticated
 from config.settings import settings
-from pages.auth_page import render_auth_page
-from pages.dashboard import render_dashboard
-from pages.admin_page import render_admin_page
 
 logger = get_logger(__name__)
 logger.info("Frontend application starting...")
 
+
+@lru_cache(maxsize=None)
+def _page_renderer(module: str, name: str) -> Callable[[], None]:
+    """
+    Import a page module on first use. Pages pull in the API clients and tab modules,
+    so the login screen only loads what it renders.
+    """
+    return getattr(importlib.import_module(module), name)
+
+
+def render_admin():
+    """Admin panel (/admin)."""
+    _page_renderer("pages.admin_page", "render_admin_page")()
+
+
 def render_home():
     """
     Default landing page (/).
@@ -20,9 +36,9 @@ def render_home():
     """
     role = st.session_state.get("role", "user")
     if role == "admin":
-        render_admin_page()
+        render_admin()
     else:
-        render_dashboard()
+        _page_renderer("pages.dashboard", "render_dashboard")()
 
 
 def main():
@@ -42,7 +58,7 @@ def main():
     # Route to appropriate page based on authentication
     if not is_authenticated():
         logger.debug("User not authenticated - showing login/signup")
-        render_auth_page()
+        _page_renderer("pages.auth_page", "render_auth_page")()
     else:
         user_email = st.session_state.get('email')
         user_role = st.session_state.get('role', 'user')
@@ -56,7 +72,7 @@ def main():
             ],
             "Admin": [
                 # Always register /admin; the page itself will enforce role-based access.
-                st.Page(render_admin_page, title="Admin Panel", icon="🛡️", url_path="admin"),
+                st.Page(render_admin, title="Admin Panel", icon="🛡️", url_path="admin"),
             ],
         }
 
@@ -1,161 +1,390 @@
 """
-Real-time progress viewer component using polling.
+Real-time progress viewer component using long-polling.
+
+Polling runs on a background thread; a Streamlit fragment refreshes the UI from what
+it has fetched, so the script thread is never blocked while a project is processed.
 """
+import httpx
 import streamlit as st
+import queue
+import threading
 import time
-from typing import Optional
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 from core.logging import get_logger
-from api.client import get_client, handle_http_error
+from api.client import get_client, handle_http_error, response_json
 
 logger = get_logger(__name__)
 
+# Seconds the backend may hold each progress request open (long-poll).
+LONG_POLL_WAIT = 25.0
+# Give up monitoring after 10 minutes.
+MAX_MONITOR_SECONDS = 600.0
+# Poll pacing bounds (seconds) for the adaptive backoff.
+MIN_POLL_INTERVAL = 0.25
+MAX_POLL_INTERVAL = 5.0
+# Activity entries kept per project.
+ACTIVITY_LOG_MAX = 200
+# How often the viewer fragment redraws from the poller's queue. The poller queues
+# every payload in the background, so a slower redraw loses no activity entries.
+UI_REFRESH_SECONDS = 2.0
+# A poller whose viewer has not been drawn for this long (the user navigated away,
+# closed the card or the session ended) stops after its current request.
+POLLER_IDLE_SECONDS = 15.0
+
+_EMOJI_MAP = {
+    'info': 'ℹ️',
+    'success': '✅',
+    'warning': '⚠️',
+    'error': '❌',
+}
+
 
-def render_progress_viewer(project_id: int, auto_close: bool = True):
+def _poll_progress(
+    client, project_id: int, since_id: int, wait: float = LONG_POLL_WAIT
+) -> Tuple[bool, Union[Dict, str]]:
     """
-    Render real-time progress viewer for a project using polling.
+    One (long-)poll request. Returns (True, payload) or (False, error message).
     
-    Args:
-        project_id: Project ID to monitor
-        auto_close: If True, automatically close when complete
+    The status code is checked directly instead of raise_for_status(), so the poll
+    loop only takes an exception path for transport failures.
+    """
+    try:
+        response = client.get(
+            f"/projects/{project_id}/progress",
+            params={'since_id': since_id, 'wait': wait}
+        )
+    except httpx.RequestError as e:
+        return False, handle_http_error(e, "Fetch progress", logger)
+    if not response.is_success:
+        error = httpx.HTTPStatusError(
+            f"HTTP {response.status_code}", request=response.request, response=response
+        )
+        return False, handle_http_error(error, "Fetch progress", logger)
+    return True, response_json(response)
+
+
+def _all_files_processed(data: Dict) -> bool:
+    """True while still `processing` but the latest update reports every file done."""
+    progress_updates = data.get('progress')
+    if data.get('current_status') != 'processing' or not progress_updates:
+        return False
+    total_files = progress_updates[-1].get('total_files', 0)
+    return total_files > 0 and progress_updates[-1].get('files_processed', 0) >= total_files
+
+
+class _ProgressPoller:
     """
-    logger.info(f"Starting progress viewer for project {project_id}")
+    Long-polls a project's progress on a daemon thread and queues every payload.
     
-    # Create containers for UI elements
-    progress_container = st.container()
+    The thread makes no Streamlit calls; the viewer fragment drains `payloads` on the
+    script thread. Special payloads: {"error": msg} and {"timed_out": True}.
+    """
     
-    with progress_container:
-        progress_bar = st.progress(0.0)
-        status_text = st.empty()
-        
-        # Activity feed
-        activity_expander = st.expander("📋 Activity Feed", expanded=True)
+    def __init__(self, project_id: int, since_id: int = 0):
+        self.project_id = project_id
+        self.payloads: "queue.Queue[Dict]" = queue.Queue()
+        self._since_id = since_id
+        self._stop = threading.Event()
+        self._last_seen = time.monotonic()
+        # Built here on the script thread: it reads the auth token from session_state.
+        # One client for the whole monitoring session so every poll reuses the same
+        # keep-alive connection.
+        self._client = get_client(timeout=LONG_POLL_WAIT + 10.0)
+        self._thread = threading.Thread(
+            target=self._run, name=f"progress-poller-{project_id}", daemon=True
+        )
+        self._thread.start()
     
-    # Initialize state
-    if f'activity_log_{project_id}' not in st.session_state:
-        st.session_state[f'activity_log_{project_id}'] = []
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
     
-    last_id = 0
-    activity_log = st.session_state[f'activity_log_{project_id}']
-    poll_count = 0
-    max_polls = 600  # 10 minutes at 1 second intervals
+    def stop(self) -> None:
+        self._stop.set()
     
-    try:
-        while poll_count < max_polls:
-            poll_count += 1
-            
-            # Fetch latest progress updates
-            try:
-                with get_client(timeout=10.0) as client:
-                    response = client.get(
-                        f"/projects/{project_id}/progress",
-                        params={'since_id': last_id}
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-            except Exception as e:
-                error_msg = handle_http_error(e, "Fetch progress", logger)
-                st.error(f"Failed to fetch progress: {error_msg}")
-                break
-            
-            progress_updates = data.get('progress', [])
-            current_status = data.get('current_status', 'processing')
-            
-            # Process each update
-            for update in progress_updates:
-                # Update progress bar
-                percentage = update.get('percentage', 0)
-                progress_bar.progress(min(percentage / 100.0, 1.0))
-                
-                # Format status message
-                stage = update.get('stage', '').replace('_', ' ').title()
-                current_file = update.get('current_file')
-                files_processed = update.get('files_processed', 0)
-                total_files = update.get('total_files', 0)
-                message = update.get('message', '')
+    def touch(self) -> None:
+        """Record that the viewer was drawn (called on every render)."""
+        self._last_seen = time.monotonic()
+    
+    def _run(self) -> None:
+        project_id = self.project_id
+        last_id = self._since_id
+        deadline = time.monotonic() + MAX_MONITOR_SECONDS
+        interval = MIN_POLL_INTERVAL
+        logger.info("Starting progress viewer for project %s", project_id)
+        try:
+            while not self._stop.is_set():
+                if time.monotonic() - self._last_seen > POLLER_IDLE_SECONDS:
+                    # Nobody is watching; the viewer restarts a poller when drawn again.
+                    logger.info("Progress viewer for project %s no longer rendered", project_id)
+                    return
+                if time.monotonic() >= deadline:
+                    self.payloads.put({'timed_out': True})
+                    return
                 
-                if current_file and total_files > 0:
-                    status_msg = f"**{stage}**: {message} ({files_processed}/{total_files} files) - {percentage:.1f}%"
-                else:
-                    status_msg = f"**{stage}**: {message} - {percentage:.1f}%"
+                # Fetch latest progress updates; the backend holds the request until
+                # new updates arrive or the status changes (long-poll).
+                poll_started = time.monotonic()
+                ok, data = _poll_progress(self._client, project_id, last_id)
+                if not ok:
+                    self.payloads.put({'error': data})
+                    return
                 
-                status_text.markdown(status_msg)
+                progress_updates = data.get('progress', [])
+                if progress_updates:
+                    last_id = progress_updates[-1].get('id', last_id)
+                self.payloads.put(data)
                 
-                # Add to activity feed with emoji
-                message_type = update.get('message_type', 'info')
-                emoji_map = {
-                    'info': 'ℹ️',
-                    'success': '✅',
-                    'warning': '⚠️',
-                    'error': '❌'
-                }
-                emoji = emoji_map.get(message_type, 'ℹ️')
+                current_status = data.get('current_status', 'processing')
+                # Terminal, or not processing with nothing new (might be stuck).
+                if current_status in ('completed', 'failed'):
+                    logger.info("Project %s processing %s", project_id, current_status)
+                    return
+                if not progress_updates and current_status != 'processing':
+                    logger.warning("No progress updates for project %s, status: %s", project_id, current_status)
+                    return
                 
-                timestamp = update.get('timestamp', '')
-                if timestamp:
-                    time_str = timestamp.split('T')[1][:8] if 'T' in timestamp else ''
-                    activity_msg = f"{emoji} [{time_str}] {message}"
+                # Adaptive pacing: poll quickly while updates are flowing and back off
+                # (x1.5, up to 5s) while idle. Long-polled responses have already waited
+                # server-side, so only the remainder of the interval is slept.
+                # Every file processed means the status flip is imminent: stay fast.
+                if progress_updates or _all_files_processed(data):
+                    interval = MIN_POLL_INTERVAL
                 else:
-                    activity_msg = f"{emoji} {message}"
-                
-                activity_log.append(activity_msg)
-                last_id = update.get('id', last_id)
-            
-            # Update activity feed display
-            with activity_expander:
-                # Show last 30 activities, newest first
-                for activity in reversed(activity_log[-30:]):
-                    st.text(activity)
-            
-            # Check if processing is complete or failed
-            if current_status in ['completed', 'failed']:
-                logger.info(f"Project {project_id} processing {current_status}")
-                
-                if current_status == 'completed':
-                    progress_bar.progress(1.0)
-                    status_text.markdown("**✅ Processing Complete!**")
-                    st.success("🎉 Project analysis completed successfully!")
-                else:
-                    status_text.markdown("**❌ Processing Failed**")
-                    st.error("❌ Project processing failed. Please check the logs.")
-                
-                # Auto-close after brief delay
-                if auto_close:
-                    time.sleep(2)
-                break
-            
-            # If no updates and status is not processing, might be stuck
-            if not progress_updates and current_status != 'processing':
-                logger.warning(f"No progress updates for project {project_id}, status: {current_status}")
+                    interval = min(interval * 1.5, MAX_POLL_INTERVAL)
+                self._stop.wait(max(0.0, interval - (time.monotonic() - poll_started)))
+        except Exception as e:
+            logger.error("Error in progress viewer: %s", e, exc_info=True)
+            self.payloads.put({'error': f"Progress monitoring error: {e}"})
+        finally:
+            logger.info("Progress viewer stopped for project %s", project_id)
+
+
+def _view_state(project_id: int) -> Dict:
+    """Per-project viewer state kept in session_state across fragment reruns."""
+    key = f'progress_view_{project_id}'
+    if key not in st.session_state:
+        st.session_state[key] = {
+            'last_id': 0,
+            'latest': None,
+            'status': None,
+            'error': None,
+            'timed_out': False,
+        }
+    # Bounded: old entries fall off in O(1) so a long job cannot grow session_state.
+    if f'activity_log_{project_id}' not in st.session_state:
+        st.session_state[f'activity_log_{project_id}'] = deque(maxlen=ACTIVITY_LOG_MAX)
+    return st.session_state[key]
+
+
+def _apply_payload(view: Dict, activity_log: deque, data: Dict) -> None:
+    """Fold one poller payload into the viewer state."""
+    if 'error' in data:
+        view['error'] = data['error']
+        return
+    if data.get('timed_out'):
+        view['timed_out'] = True
+        return
+    
+    progress_updates = data.get('progress', [])
+    # Only the activity log needs every update; the progress bar and status line
+    # are rendered from the latest one.
+    for update in progress_updates:
+        message = update.get('message', '')
+        
+        # Add to activity feed with emoji
+        emoji = _EMOJI_MAP.get(update.get('message_type', 'info'), 'ℹ️')
+        
+        timestamp = update.get('timestamp', '')
+        if timestamp:
+            # ISO timestamp "YYYY-MM-DDTHH:MM:SS..." -> "HH:MM:SS"
+            time_str = timestamp[11:19] if len(timestamp) >= 19 and timestamp[10] == 'T' else ''
+            activity_msg = f"{emoji} [{time_str}] {message}"
+        else:
+            activity_msg = f"{emoji} {message}"
+        
+        activity_log.append(activity_msg)
+    
+    if progress_updates:
+        view['latest'] = progress_updates[-1]
+        view['last_id'] = progress_updates[-1].get('id', view['last_id'])
+    view['status'] = data.get('current_status', 'processing')
+
+
+def _finished(view: Dict) -> bool:
+    """True once there is nothing left to poll for."""
+    return bool(view['status'] in ('completed', 'failed') or view['error'] or view['timed_out'])
+
+
+def _ensure_poller(project_id: int, view: Dict) -> Optional[_ProgressPoller]:
+    """The project's poller, (re)started unless monitoring has finished."""
+    poller_key = f'progress_poller_{project_id}'
+    poller = st.session_state.get(poller_key)
+    # Start a poller unless one is running or still has undrained payloads (an idle
+    # poller that stopped because the viewer was not drawn is replaced here).
+    if not _finished(view) and (poller is None or (not poller.running and poller.payloads.empty())):
+        poller = st.session_state[poller_key] = _ProgressPoller(project_id, since_id=view['last_id'])
+    if poller is not None:
+        poller.touch()
+    return poller
+
+
+def _render_progress(project_id: int, auto_close: bool, completion_message: Optional[str]):
+    view = _view_state(project_id)
+    activity_log = st.session_state[f'activity_log_{project_id}']
+    poller = _ensure_poller(project_id, view)
+    
+    # Drain everything fetched since the last refresh
+    if poller is not None:
+        while True:
+            try:
+                _apply_payload(view, activity_log, poller.payloads.get_nowait())
+            except queue.Empty:
                 break
-            
-            # Wait before next poll
-            time.sleep(1)
+    
+    status = view['status']
+    done = status in ('completed', 'failed')
+    latest = view['latest']
+    
+    if status == 'completed':
+        st.progress(1.0)
+        st.markdown("**✅ Processing Complete!**")
+    elif status == 'failed':
+        st.progress(min(latest.get('percentage', 0) / 100.0, 1.0) if latest else 0.0)
+        st.markdown("**❌ Processing Failed**")
+    elif latest:
+        # Update progress bar
+        percentage = latest.get('percentage', 0)
+        st.progress(min(percentage / 100.0, 1.0))
+        
+        # Format status message
+        stage = latest.get('stage', '').replace('_', ' ').title()
+        current_file = latest.get('current_file')
+        files_processed = latest.get('files_processed', 0)
+        total_files = latest.get('total_files', 0)
+        message = latest.get('message', '')
+        
+        if current_file and total_files > 0:
+            status_msg = f"**{stage}**: {message} ({files_processed}/{total_files} files) - {percentage:.1f}%"
+        else:
+            status_msg = f"**{stage}**: {message} - {percentage:.1f}%"
         
-        # Timeout check
-        if poll_count >= max_polls:
-            st.warning("⏱️ Progress monitoring timed out. Project may still be processing.")
+        st.markdown(status_msg)
+    else:
+        st.progress(0.0)
     
-    except Exception as e:
-        logger.error(f"Error in progress viewer: {e}", exc_info=True)
-        st.error(f"Progress monitoring error: {str(e)}")
+    # Activity feed (collapsed once finished when auto_close is set)
+    # Show last 30 activities, newest first
+    with st.expander("📋 Activity Feed", expanded=not (auto_close and done)):
+        st.text("\n".join(islice(reversed(activity_log), 30)))
     
-    finally:
-        logger.info(f"Progress viewer stopped for project {project_id}")
+    if status == 'completed':
+        st.success("🎉 Project analysis completed successfully!")
+        if completion_message:
+            st.success(completion_message)
+    elif status == 'failed':
+        st.error("❌ Project processing failed. Please check the logs.")
+    elif view['error']:
+        st.error(f"Failed to fetch progress: {view['error']}")
+    elif view['timed_out']:
+        st.warning("⏱️ Progress monitoring timed out. Project may still be processing.")
+
 
+@st.fragment(run_every=UI_REFRESH_SECONDS)
+def _render_progress_fragment(project_id: int, auto_close: bool, completion_message: Optional[str]):
+    _render_progress(project_id, auto_close, completion_message)
+    if _finished(_view_state(project_id)):
+        # Only a full rerun cancels `run_every`; it redraws the viewer statically.
+        st.rerun()
 
-def show_progress_indicator(project_id: int):
+
+def render_progress_viewer(
+    project_id: int,
+    auto_close: bool = True,
+    completion_message: Optional[str] = None,
+):
+    """
+    Render real-time progress viewer for a project.
+    
+    Starts (or reuses) a background poller for the project and returns immediately;
+    the viewer refreshes itself every `UI_REFRESH_SECONDS` until processing finishes,
+    then is drawn once more without refreshing. A poller whose viewer stops being
+    drawn exits after `POLLER_IDLE_SECONDS`.
+    
+    Args:
+        project_id: Project ID to monitor
+        auto_close: If True, collapse the activity feed when complete
+        completion_message: Extra message shown once processing completes
+    """
+    view = _view_state(project_id)
+    if st.session_state.get(f'progress_poller_{project_id}') is None and view['status'] is None:
+        # First render: one non-blocking check, so a project that already finished
+        # (e.g. when returning to the tab) is drawn without starting a poller.
+        ok, data = _poll_progress(get_client(timeout=10.0), project_id, view['last_id'], wait=0.0)
+        _apply_payload(view, st.session_state[f'activity_log_{project_id}'], data if ok else {'error': data})
+    
+    if _finished(view):
+        _render_progress(project_id, auto_close, completion_message)
+    else:
+        _render_progress_fragment(project_id, auto_close, completion_message)
+
+
+def stop_progress_viewer(project_id: int) -> None:
+    """Stop the background poller for a project and forget its viewer state."""
+    poller = st.session_state.pop(f'progress_poller_{project_id}', None)
+    if poller is not None:
+        poller.stop()
+    st.session_state.pop(f'progress_view_{project_id}', None)
+
+
+def fetch_all_progress(project_ids: List[int]) -> Dict[int, Optional[Dict]]:
+    """
+    Fetch the progress of several projects concurrently over the shared client, so
+    a list of K processing projects costs one round trip instead of K.
+    
+    Args:
+        project_ids: Project IDs to fetch
+    
+    Returns:
+        Mapping of project ID to its progress payload (None if the fetch failed)
+    """
+    if not project_ids:
+        return {}
+    # Built on the script thread: it reads the auth token from session_state.
+    client = get_client(timeout=5.0)
+    
+    def fetch(project_id: int) -> Optional[Dict]:
+        try:
+            response = client.get(f"/projects/{project_id}/progress", params={'since_id': 0})
+            response.raise_for_status()
+            return response_json(response)
+        except Exception as e:
+            logger.error("Error fetching progress for project %s: %s", project_id, e)
+            return None
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(project_ids))) as ex:
+        return dict(zip(project_ids, ex.map(fetch, project_ids)))
+
+
+def show_progress_indicator(project_id: int, data: Optional[Dict] = None):
     """
     Show a compact progress indicator for a project.
     Suitable for project list displays.
     
     Args:
         project_id: Project ID to monitor
+        data: Progress payload already fetched (e.g. by `fetch_all_progress`);
+            fetched here when omitted
     """
     try:
-        with get_client(timeout=5.0) as client:
-            response = client.get(f"/projects/{project_id}/progress", params={'since_id': 0})
-            response.raise_for_status()
-            data = response.json()
+        if data is None:
+            data = fetch_all_progress([project_id])[project_id]
+        if data is None:
+            st.caption("Processing...")
+            return
         
         progress_updates = data.get('progress', [])
         if progress_updates:
@@ -167,5 +396,5 @@ def show_progress_indicator(project_id: int):
             st.caption(f"{message} ({percentage:.0f}%)")
     
     except Exception as e:
-        logger.error(f"Error showing progress indicator: {e}")
+        logger.error("Error showing progress indicator: %s", e)
         st.caption("Processing...")
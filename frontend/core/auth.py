@@ -3,7 +3,7 @@ Authentication state helpers.
 """
 import streamlit as st
 from core.logging import get_logger
-from core.session import clear_session_state
+from core.session import clear_session_state, current_email, forget_current_email
 
 logger = get_logger(__name__)
 
@@ -13,12 +13,13 @@ def set_auth_state(token: str, email: str, role: str = "user"):
     st.session_state["token"] = token
     st.session_state["email"] = email
     st.session_state["role"] = role
+    forget_current_email()
     logger.info(f"Authentication state set | email: {email} | role: {role}")
 
 
 def clear_auth_state():
     """Clear authentication state"""
-    email = st.session_state.get("email", "unknown")
+    email = current_email()
     logger.info(f"Clearing authentication state | user: {email}")
     clear_session_state()
 
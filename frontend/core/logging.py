@@ -1,10 +1,12 @@
 """
 Centralized logging configuration for the frontend Streamlit application.
 """
+import atexit
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
 
 # Create logs directory
@@ -14,23 +16,25 @@ LOGS_DIR.mkdir(parents=True, exist_ok=True)
 # Get log level from environment or default to INFO
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
-def get_logger(name: str) -> logging.Logger:
+# Parent of every application logger; the only logger that owns handlers.
+_ROOT_LOGGER_NAME = "frontend"
+_CONFIGURED = False
+
+
+def _configure_root_logger() -> logging.Logger:
     """
-    Create and configure a logger with both file and console handlers.
-    
-    Args:
-        name: Name of the logger (typically __name__ of the module)
-    
-    Returns:
-        Configured logger instance
+    Route the `frontend` logger to the console and rotating file handlers, once per
+    process. Module loggers are its children and propagate to it, so the log files
+    are opened (and rotated) by a single set of handlers.
     """
-    logger = logging.getLogger(name)
+    global _CONFIGURED
+    root = logging.getLogger(_ROOT_LOGGER_NAME)
+    if _CONFIGURED:
+        return root
     
-    # Avoid adding handlers multiple times
-    if logger.handlers:
-        return logger
-    
-    logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+    root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+    # Output goes only to the handlers below (nothing is configured on the root logger).
+    root.propagate = False
     
     # Create formatters
     detailed_formatter = logging.Formatter(
@@ -68,9 +72,33 @@ def get_logger(name: str) -> logging.Logger:
     error_file_handler.setLevel(logging.ERROR)
     error_file_handler.setFormatter(detailed_formatter)
     
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    logger.addHandler(error_file_handler)
+    # Loggers only enqueue records; a background listener owns the real handlers,
+    # so rotation checks and disk writes never run on the Streamlit script thread.
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    listener = QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        error_file_handler,
+        respect_handler_level=True,
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    root.addHandler(QueueHandler(log_queue))
+    
+    _CONFIGURED = True
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a module logger that writes through the shared `frontend` handlers.
     
-    return logger
+    Args:
+        name: Name of the logger (typically __name__ of the module)
+    
+    Returns:
+        Configured logger instance
+    """
+    _configure_root_logger()
+    return logging.getLogger(f"{_ROOT_LOGGER_NAME}.{name}")
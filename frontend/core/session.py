@@ -1,8 +1,18 @@
 """
 Session state management utilities.
 """
+import threading
+
 import streamlit as st
 
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:  # very old Streamlit: fall back to reading session_state every time
+    get_script_run_ctx = None
+
+# (script-run context, email) for the current thread; see current_email().
+_email_cache = threading.local()
+
 
 def init_session_state():
     """Initialize session state variables"""
@@ -20,6 +30,28 @@ def clear_session_state():
     """Clear all session state"""
     for key in list(st.session_state.keys()):
         del st.session_state[key]
+    forget_current_email()
+
+
+def current_email() -> str:
+    """
+    Email of the logged-in user ("unknown" if none), used for log lines.
+
+    Read from session_state once per script-run context and memoized on the script
+    thread; `set_auth_state`/`clear_session_state` reset it when the user changes.
+    """
+    ctx = get_script_run_ctx() if get_script_run_ctx is not None else None
+    cached = getattr(_email_cache, "value", None)
+    if ctx is not None and cached is not None and cached[0] is ctx:
+        return cached[1]
+    email = st.session_state.get("email", "unknown")
+    _email_cache.value = (ctx, email)
+    return email
+
+
+def forget_current_email():
+    """Drop the memoized email (after login/logout)."""
+    _email_cache.value = None
 
 
 def is_authenticated() -> bool:
@@ -10,12 +10,10 @@ import streamlit as st
 
 from core.logging import get_logger
 from api.admin import (
-    admin_get_analytics,
-    admin_list_users,
+    admin_get_overview,
     admin_create_user,
     admin_update_user,
     admin_delete_user,
-    admin_list_projects,
 )
 
 logger = get_logger(__name__)
@@ -39,7 +37,9 @@ def render_admin_page():
     st.title("Admin Panel")
     st.caption("User management, project management, and analytics.")
 
-    analytics = admin_get_analytics() or {}
+    # One concurrent fan-out instead of three sequential round trips.
+    analytics, users, projects = admin_get_overview()
+    analytics = analytics or {}
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Total users", analytics.get("total_users", 0))
@@ -66,7 +66,6 @@ def render_admin_page():
                         st.success(f"Created user {created.get('email')}")
                         st.rerun()
 
-        users = admin_list_users()
         if not users:
             st.info("No users found.")
         else:
@@ -105,7 +104,6 @@ def render_admin_page():
 
     with tab2:
         st.subheader("Projects")
-        projects = admin_list_projects()
         if not projects:
             st.info("No projects found.")
         else:
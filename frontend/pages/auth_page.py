@@ -1,22 +1,20 @@
 """
 Authentication page (Login/Signup).
 """
+import re
+
 import streamlit as st
 from core.logging import get_logger
 from api.auth import login_user, register_user
 
 logger = get_logger(__name__)
 
+# local@domain where the domain contains a dot and neither starts nor ends with one.
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s.][^@\s]*\.[^@\s]*[^@\s.]")
+
+
 def _is_valid_email(value: str) -> bool:
-    value = (value or "").strip()
-    if "@" not in value:
-        return False
-    local, _, domain = value.partition("@")
-    if not local or "." not in domain:
-        return False
-    if domain.startswith(".") or domain.endswith("."):
-        return False
-    return True
+    return _EMAIL_RE.fullmatch((value or "").strip()) is not None
 
 
 def render_auth_page():
@@ -12,6 +12,23 @@ from pages.tabs.documentation_tab import render_documentation_tab
 
 logger = get_logger(__name__)
 
+# Dashboard sections: label -> (query-param slug, renderer). Only the selected one is
+# rendered, so a rerun does not run every tab's API calls and widgets.
+_SECTIONS = {
+    "Create Project": ("create", render_create_project_tab),
+    "My Projects": ("projects", render_projects_tab),
+    "💬 Chat with Code": ("chat", render_chat_tab),
+    "📄 Documentation": ("docs", render_documentation_tab),
+    "⚙️ Configuration": ("config", render_config_tab),
+}
+_LABELS = list(_SECTIONS)
+_LABEL_BY_SLUG = {slug: label for label, (slug, _) in _SECTIONS.items()}
+
+
+def _sync_section_query_param():
+    """Mirror the selected section into the URL so a refresh reopens it."""
+    st.query_params["tab"] = _SECTIONS[st.session_state["active_tab"]][0]
+
 
 def render_dashboard():
     """Render the main dashboard"""
@@ -23,26 +40,16 @@ def render_dashboard():
     # Main content
     st.title("Dashboard")
     
-    # Create tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "Create Project", 
-        "My Projects", 
-        "💬 Chat with Code",
-        "📄 Documentation",
-        "⚙️ Configuration",
-    ])
-    
-    with tab1:
-        render_create_project_tab() 
+    # Section selector (restored from ?tab=... on a fresh session)
+    if "active_tab" not in st.session_state:
+        st.session_state["active_tab"] = _LABEL_BY_SLUG.get(st.query_params.get("tab"), _LABELS[0])
+    choice = st.radio(
+        "Section",
+        _LABELS,
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed",
+        on_change=_sync_section_query_param,
+    )
     
-    with tab2:
-        render_projects_tab()
-    
-    with tab3:
-        render_chat_tab()
-
-    with tab4:
-        render_documentation_tab()
-
-    with tab5:
-        render_config_tab()
+    _SECTIONS[choice][1]()
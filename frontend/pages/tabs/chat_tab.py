@@ -1,16 +1,56 @@
 """
 Chat with Code tab component.
 """
+import gc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from api.projects import get_projects
 from api.chat import (
     create_chat_session,
     get_chat_sessions,
-    get_chat_session,
-    send_chat_message,
+    get_chat_messages,
+    stream_chat_message,
     delete_chat_session
 )
 from api.analysis_configs import get_analysis_configs
+from utils.config_helpers import config_summary
+
+# Chat sessions listed per page of the "Previous Chats" grid.
+SESSIONS_PAGE_SIZE = 12
+
+# Messages kept in session_state (the newest ones); older pages are fetched on demand.
+CHAT_HISTORY_WINDOW = 50
+
+
+def _append_chat_message(role: str, content: str):
+    """Append a message, keeping only the newest CHAT_HISTORY_WINDOW in session_state."""
+    messages = st.session_state['chat_messages']
+    messages.append({'role': role, 'content': content})
+    excess = len(messages) - CHAT_HISTORY_WINDOW
+    if excess > 0:
+        del messages[:excess]
+        st.session_state['chat_has_older'] = True
+
+
+def _fetch_chat_tab_data(project_id: Optional[int]) -> Tuple[List[Dict], List[Dict], Optional[List[Dict]]]:
+    """
+    Fetch projects, analysis configs and (for the last selected project) chat sessions
+    concurrently, so entering the tab costs one round trip instead of three.
+    """
+    # Workers share this script run's context: the API helpers read session_state.
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx, initargs=(None, ctx)) as ex:
+        f_projects = ex.submit(get_projects)
+        f_configs = ex.submit(get_analysis_configs)
+        f_sessions = ex.submit(get_chat_sessions, project_id) if project_id is not None else None
+        return (
+            f_projects.result(),
+            f_configs.result(),
+            f_sessions.result() if f_sessions is not None else None,
+        )
 
 
 def render_chat_tab():
@@ -18,31 +58,32 @@ def render_chat_tab():
     st.subheader("💬 Chat with Your Code")
     st.write("Ask questions about your code using AI-powered conversational search.")
 
+    last_project_id = st.session_state.get('chat_project_id')
+    projects, configs, chat_sessions = _fetch_chat_tab_data(last_project_id)
+
     with st.expander("⚙️ Chat Configuration", expanded=False):
-        render_chat_config_selector()
+        render_chat_config_selector(configs)
     
     # Initialize session state for chat
     if 'current_chat_session' not in st.session_state:
         st.session_state['current_chat_session'] = None
     if 'chat_messages' not in st.session_state:
         st.session_state['chat_messages'] = []
-    
-    # Get all projects
-    projects = get_projects()
+        st.session_state['chat_has_older'] = False
     
     if not projects:
         st.info("You don't have any projects yet. Create one first!")
         return
     
     # Project selection and new chat button
-    render_chat_header(projects)
+    project_labels = {p['id']: f"{p['title']} (ID: {p['id']})" for p in projects}
+    selected_project_id = render_chat_header(project_labels)
+    st.session_state['chat_project_id'] = selected_project_id
     
-    # Get chat sessions for selected project
-    selected_project_label = st.session_state.get('chat_project_select')
-    if selected_project_label:
-        project_options = {f"{p['title']} (ID: {p['id']})": p['id'] for p in projects}
-        selected_project_id = project_options[selected_project_label]
-        chat_sessions = get_chat_sessions(selected_project_id)
+    # Get chat sessions for selected project (already fetched unless it just changed)
+    if selected_project_id is not None:
+        if chat_sessions is None or selected_project_id != last_project_id:
+            chat_sessions = get_chat_sessions(selected_project_id)
         
         # Display chat sessions sidebar
         if chat_sessions:
@@ -54,18 +95,19 @@ def render_chat_tab():
         render_chat_interface()
 
 
-def render_chat_header(projects):
-    """Render project selector and new chat button"""
+def render_chat_header(project_labels: Dict[int, str]) -> int:
+    """Render project selector and new chat button; returns the selected project ID"""
     col_proj, col_sess = st.columns([2, 1])
     
     with col_proj:
-        project_options = {f"{p['title']} (ID: {p['id']})": p['id'] for p in projects}
-        selected_project_label = st.selectbox(
+        # Options are the project IDs, so the widget state is a small int that stays
+        # valid when projects are added or renamed.
+        selected_project_id = st.selectbox(
             "Select Project",
-            list(project_options.keys()),
+            project_labels,
+            format_func=project_labels.__getitem__,
             key="chat_project_select"
         )
-        selected_project_id = project_options[selected_project_label]
     
     with col_sess:
         if st.button("➕ New Chat", type="primary"):
@@ -73,8 +115,11 @@ def render_chat_header(projects):
             if new_session:
                 st.session_state['current_chat_session'] = new_session['id']
                 st.session_state['chat_messages'] = []
+                st.session_state['chat_has_older'] = False
                 st.success("New chat session created!")
                 st.rerun()
+    
+    return selected_project_id
 
 
 def render_chat_sessions_list(chat_sessions):
@@ -82,25 +127,31 @@ def render_chat_sessions_list(chat_sessions):
     st.divider()
     st.caption("💾 Previous Chats")
     
+    # Sessions arrive most recently updated first; only the first `shown` get widgets.
+    shown = st.session_state.get('chat_sessions_shown', SESSIONS_PAGE_SIZE)
+    visible = chat_sessions[:shown]
+    
     cols_per_row = 3
-    for i in range(0, len(chat_sessions), cols_per_row):
+    for i in range(0, len(visible), cols_per_row):
         cols = st.columns(cols_per_row)
-        for j, session in enumerate(chat_sessions[i:i+cols_per_row]):
+        for j, session in enumerate(visible[i:i+cols_per_row]):
             with cols[j]:
-                session_title = session['title'][:30] + "..." if len(session['title']) > 30 else session['title']
-                
                 button_col, delete_col = st.columns([4, 1])
                 with button_col:
                     if st.button(
-                        f"📝 {session_title}",
+                        f"📝 {session['display_title']}",
                         key=f"load_session_{session['id']}",
                         use_container_width=True
                     ):
                         st.session_state['current_chat_session'] = session['id']
-                        # Load messages
-                        session_data = get_chat_session(session['id'])
-                        if session_data:
-                            st.session_state['chat_messages'] = session_data.get('messages', [])
+                        # Load the newest messages only; older ones are paged in on demand
+                        messages = get_chat_messages(session['id'], limit=CHAT_HISTORY_WINDOW)
+                        if messages is not None:
+                            st.session_state['chat_messages'] = messages
+                            st.session_state['chat_has_older'] = len(messages) == CHAT_HISTORY_WINDOW
+                        # The previous session's messages are garbage now; collect
+                        # fully so a long history is not held until a later GC pass.
+                        gc.collect(2)
                         st.rerun()
                 
                 with delete_col:
@@ -109,8 +160,15 @@ def render_chat_sessions_list(chat_sessions):
                             if st.session_state.get('current_chat_session') == session['id']:
                                 st.session_state['current_chat_session'] = None
                                 st.session_state['chat_messages'] = []
+                                st.session_state['chat_has_older'] = False
+                                gc.collect(2)
                             st.success("Chat deleted!")
                             st.rerun()
+    
+    if len(chat_sessions) > shown:
+        if st.button(f"Show more ({len(chat_sessions) - shown} older)", key="chat_sessions_more"):
+            st.session_state['chat_sessions_shown'] = shown + SESSIONS_PAGE_SIZE
+            st.rerun()
 
 
 def render_chat_interface():
@@ -120,124 +178,110 @@ def render_chat_interface():
         
         # Display chat messages
         chat_container = st.container()
+        greeting = None
         with chat_container:
-            if st.session_state['chat_messages']:
-                for msg in st.session_state['chat_messages']:
-                    if msg['role'] == 'user':
-                        with st.chat_message("user"):
-                            st.write(msg['content'])
-                    elif msg['role'] == 'assistant':
-                        with st.chat_message("assistant"):
-                            st.write(msg['content'])
+            messages = st.session_state['chat_messages']
+            if messages:
+                if st.session_state.get('chat_has_older') and st.button("⬆️ Load earlier messages", key="chat_load_older"):
+                    older = get_chat_messages(current_session_id, limit=CHAT_HISTORY_WINDOW, offset=len(messages))
+                    if older is not None:
+                        messages[:0] = older
+                        st.session_state['chat_has_older'] = len(older) == CHAT_HISTORY_WINDOW
+                for msg in messages:
+                    if msg['role'] in ('user', 'assistant'):
+                        with st.chat_message(msg['role']):
+                            st.markdown(msg['content'])
             else:
-                st.info("👋 Start a conversation! Ask me anything about your code.")
+                greeting = st.empty()
+                greeting.info("👋 Start a conversation! Ask me anything about your code.")
         
         # Chat input
         user_input = st.chat_input("Ask a question about your code...", key="chat_input")
         
         if user_input:
-            # Display user message immediately
-            with st.chat_message("user"):
-                st.write(user_input)
+            if greeting is not None:
+                greeting.empty()
             
-            # Add to session state
-            st.session_state['chat_messages'].append({
-                'role': 'user',
-                'content': user_input
-            })
+            # Record first, so the message survives even if rendering below is cut
+            # short by the next rerun; then display it immediately.
+            _append_chat_message('user', user_input)
+            with st.chat_message("user"):
+                st.markdown(user_input)
             
-            # Send message and get response
-            with st.spinner("🤔 Thinking..."):
-                response = send_chat_message(
-                    current_session_id,
-                    user_input,
-                    config_id=st.session_state.get("chat_config_id"),
+            # Send message and render the response as it streams in
+            stream_result = {}
+            with st.chat_message("assistant"):
+                st.write_stream(
+                    stream_chat_message(
+                        current_session_id,
+                        user_input,
+                        config_id=st.session_state.get("chat_config_id"),
+                        result=stream_result,
+                    )
                 )
+                response = stream_result.get("response")
+
+                # Show retrieved chunks if available
+                if response and response.get('retrieved_chunks'):
+                    with st.expander("📚 Retrieved Code Chunks"):
+                        for idx, chunk in enumerate(response['retrieved_chunks'], 1):
+                            st.text(f"Chunk {idx}:")
+                            st.text(chunk)
+                            st.divider()
             
+            # Already on screen, so no rerun: the next chat_input submission reruns anyway.
             if response:
-                # Display assistant response
-                with st.chat_message("assistant"):
-                    st.write(response['message']['content'])
-                    
-                    # Show retrieved chunks if available
-                    if response.get('retrieved_chunks'):
-                        with st.expander("📚 Retrieved Code Chunks"):
-                            for idx, chunk in enumerate(response['retrieved_chunks'], 1):
-                                st.text(f"Chunk {idx}:")
-                                st.text(chunk)
-                                st.divider()
-                
-                # Add to session state
-                st.session_state['chat_messages'].append({
-                    'role': 'assistant',
-                    'content': response['message']['content']
-                })
-                
-                st.rerun()
+                _append_chat_message('assistant', response['message']['content'])
     
     else:
         st.info("👈 Click '➕ New Chat' to start a conversation, or select a previous chat session.")
 
 
-def render_chat_config_selector():
+def render_chat_config_selector(configs: List[Dict]):
     """Read-only config selector: pick from saved configurations."""
-    configs = get_analysis_configs()
     if not configs:
         st.info("No saved configurations yet. Create one in the Configuration tab.")
         st.session_state["chat_config_id"] = None
         return
 
-    # Build options (backend returns default first).
+    # Build options (backend returns default first) with lookup maps, in one pass.
     labels = []
-    ids = []
+    id_to_idx: Dict[int, int] = {}
+    label_to_id: Dict[str, int] = {}
+    id_to_cfg: Dict[int, Dict] = {}
+    default_id = None
     for cfg in configs:
         cfg_id = cfg.get("id")
         if cfg_id is None:
             continue
-        label = f"{'⭐ ' if cfg.get('is_default') else ''}{cfg.get('name', 'Untitled')} (ID: {cfg_id})"
+        cfg_id = int(cfg_id)
+        label = f"{config_summary(cfg)[0]} (ID: {cfg_id})"
+        id_to_idx[cfg_id] = len(labels)
+        label_to_id[label] = cfg_id
+        id_to_cfg[cfg_id] = cfg
         labels.append(label)
-        ids.append(int(cfg_id))
+        if default_id is None and cfg.get("is_default"):
+            default_id = cfg_id
 
-    if not ids:
+    if not labels:
         st.info("No usable configurations returned from server.")
         st.session_state["chat_config_id"] = None
         return
 
-    default_id = next((int(c["id"]) for c in configs if c.get("is_default") and c.get("id") is not None), ids[0])
-
     # Initialize / repair selection if config was deleted.
-    if st.session_state.get("chat_config_id") not in ids:
-        st.session_state["chat_config_id"] = default_id
+    if st.session_state.get("chat_config_id") not in id_to_idx:
+        st.session_state["chat_config_id"] = default_id if default_id is not None else label_to_id[labels[0]]
 
-    selected_id = int(st.session_state["chat_config_id"])
-    try:
-        selected_index = ids.index(selected_id)
-    except ValueError:
-        selected_index = 0
-        st.session_state["chat_config_id"] = ids[0]
+    selected_index = id_to_idx[int(st.session_state["chat_config_id"])]
 
     selected_label = st.selectbox("Select configuration", labels, index=selected_index, key="chat_config_select")
-    st.session_state["chat_config_id"] = ids[labels.index(selected_label)]
+    st.session_state["chat_config_id"] = label_to_id[selected_label]
 
     # Show details (read-only).
-    selected_cfg = next((c for c in configs if int(c.get("id", -1)) == int(st.session_state["chat_config_id"])), None)
+    selected_cfg = id_to_cfg.get(st.session_state["chat_config_id"])
     if not selected_cfg:
         return
 
-    st.caption(
-        f"Depth: {selected_cfg.get('analysis_depth')} | "
-        f"Verbosity: {selected_cfg.get('doc_verbosity')} | "
-        f"Persona: {selected_cfg.get('persona_mode')}"
-    )
-    agents = []
-    if selected_cfg.get("enable_file_structure_agent"):
-        agents.append("FileStructure")
-    if selected_cfg.get("enable_api_agent"):
-        agents.append("API")
-    if selected_cfg.get("enable_web_augmented"):
-        agents.append("Web")
-    if selected_cfg.get("enable_sde_agent"):
-        agents.append("SDE")
-    if selected_cfg.get("enable_pm_agent"):
-        agents.append("PM")
-    st.caption("Agents: " + (", ".join(agents) if agents else "None"))
+    _, settings_caption, agents_caption = config_summary(selected_cfg)
+    st.caption(settings_caption)
+    st.caption(agents_caption)
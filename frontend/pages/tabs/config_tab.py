@@ -5,6 +5,8 @@ This is the "Configuration page" referenced by the chat tab.
 """
 from __future__ import annotations
 
+import gc
+
 import streamlit as st
 from typing import Dict
 
@@ -14,6 +16,7 @@ from api.analysis_configs import (
     get_analysis_configs,
     set_default_analysis_config,
 )
+from utils.config_helpers import config_summary
 
 
 def render_config_tab():
@@ -77,8 +80,8 @@ def _render_create_form():
 
     created = create_analysis_config(payload)
     if created:
+        # No rerun: the saved list renders after this form and already includes it.
         st.success(f"Saved configuration: {created.get('name')}")
-        st.rerun()
     else:
         st.error("Failed to create configuration.")
 
@@ -92,22 +95,11 @@ def _render_saved_configs():
         return
 
     for cfg in configs:
-        title = f"{'⭐ ' if cfg.get('is_default') else ''}{cfg.get('name', 'Untitled')}"
+        title, settings_caption, agents_caption = config_summary(cfg)
         with st.expander(title, expanded=False):
-            st.caption(f"Depth: {cfg.get('analysis_depth')} | Verbosity: {cfg.get('doc_verbosity')} | Persona: {cfg.get('persona_mode')}")
-
-            agents = []
-            if cfg.get("enable_file_structure_agent"):
-                agents.append("FileStructure")
-            if cfg.get("enable_api_agent"):
-                agents.append("API")
-            if cfg.get("enable_web_augmented"):
-                agents.append("Web")
-            if cfg.get("enable_sde_agent"):
-                agents.append("SDE")
-            if cfg.get("enable_pm_agent"):
-                agents.append("PM")
-            st.caption("Agents: " + ", ".join(agents))
+            st.caption(settings_caption)
+
+            st.caption(agents_caption)
 
             col1, col2 = st.columns(2)
             with col1:
@@ -120,6 +112,7 @@ def _render_saved_configs():
             with col2:
                 if st.button("🗑️ Delete", key=f"del_cfg_{cfg['id']}", use_container_width=True):
                     if delete_analysis_config(cfg["id"]):
+                        gc.collect(2)
                         st.success("Deleted.")
                         st.rerun()
                     else:
@@ -1,11 +1,14 @@
 """
 Create Project tab component.
 """
+import gc
+
 import streamlit as st
-import httpx
-from api.projects import create_project
-from api.client import get_client, handle_http_error
+from api.projects import create_project, invalidate_projects_cache, upload_part
+from api.client import UPLOAD_TIMEOUT, get_client, handle_http_error, response_json, json_dumps
+from components.progress_viewer import render_progress_viewer, stop_progress_viewer
 from core.logging import get_logger
+from core.session import current_email
 from config.settings import settings
 
 logger = get_logger(__name__)
@@ -15,31 +18,38 @@ def render_create_project_tab():
     """Render the create project tab"""
     st.subheader("Create New Project")
     
-    project_title = st.text_input("Project Title")
-    project_description = st.text_area("Project Description")
+    # One form, so typing and picking files do not rerun the app; both source inputs
+    # are shown and the radio is read on submit.
+    with st.form("create_project_form"):
+        project_title = st.text_input("Project Title")
+        project_description = st.text_area("Project Description")
 
-    upload_type = st.radio("Upload Project By:", ("ZIP File", "GitHub URL"))
-    zip_file = None
-    github_url = None
+        upload_type = st.radio("Upload Project By:", ("ZIP File", "GitHub URL"))
 
-    if upload_type == "ZIP File":
         st.caption(f"Max ZIP upload size: {settings.MAX_FILE_SIZE / (1024 * 1024):.0f} MB.")
         zip_file = st.file_uploader("Upload ZIP File", type=["zip"])
-    else:
         st.caption("Max GitHub repo size: 100 MB.")
         github_url = st.text_input(
             "GitHub Repository URL",
             placeholder="e.g., https://github.com/owner/repo.git"
         )
 
-    personas_options = ["SDE", "PM"]
-    selected_personas = st.multiselect(
-        "Select Personas for Documentation",
-        options=personas_options,
-        default=personas_options
-    )
+        personas_options = ["SDE", "PM"]
+        selected_personas = st.multiselect(
+            "Select Personas for Documentation",
+            options=personas_options,
+            default=personas_options
+        )
+
+        submitted = st.form_submit_button("Create Project", type="primary")
+
+    if submitted:
+        # Only the chosen source is sent.
+        if upload_type == "ZIP File":
+            github_url = None
+        else:
+            zip_file = None
 
-    if st.button("Create Project", type="primary"):
         if project_title:
             if upload_type == "ZIP File" and zip_file is None:
                 st.warning("Please upload a ZIP file.")
@@ -57,12 +67,37 @@ def render_create_project_tab():
         else:
             st.warning("Project title cannot be empty.")
 
+    render_creation_progress()
+
+
+def render_creation_progress():
+    """
+    Live progress of the project created last, kept across reruns (the viewer reruns
+    the app once processing finishes) until dismissed.
+    """
+    project_id = st.session_state.get('created_project_id')
+    if project_id is None:
+        return
+    
+    # Show live progress monitoring
+    st.markdown("### 🔄 Live Processing Progress")
+    st.info("Watch your project being analyzed in real-time...")
+    
+    render_progress_viewer(
+        project_id,
+        auto_close=True,
+        completion_message="🎉 All done! Go to the 'Your Projects' tab to see your project.",
+    )
+    
+    if st.button("Dismiss", key="dismiss_creation_progress"):
+        stop_progress_viewer(project_id)
+        st.session_state.pop('created_project_id', None)
+        st.rerun()
+
 
 def create_project_with_progress(title: str, description: str, personas: list, zip_file=None, github_url: str = None):
     """Create a project and display live progress"""
-    import json
-    
-    user_email = st.session_state.get("email", "unknown")
+    user_email = current_email()
     source_type = "ZIP" if zip_file else "GitHub URL" if github_url else "none"
     logger.info(f"Project creation started | user: {user_email} | title: {title} | source: {source_type}")
     
@@ -70,7 +105,7 @@ def create_project_with_progress(title: str, description: str, personas: list, z
     data = {
         "title": title,
         "description": description,
-        "personas": json.dumps(personas)
+        "personas": json_dumps(personas)
     }
 
     if zip_file:
@@ -81,7 +116,7 @@ def create_project_with_progress(title: str, description: str, personas: list, z
             logger.warning(f"ZIP file too large: {file_size_mb:.2f}MB | user: {user_email}")
             st.error(f"File too large. Max size is {settings.MAX_FILE_SIZE / (1024 * 1024)} MB.")
             return
-        files = {"zip_file": (zip_file.name, zip_file.getvalue(), zip_file.type)}
+        files = {"zip_file": upload_part(zip_file)}
     elif github_url:
         logger.debug(f"GitHub URL provided: {github_url}")
         data["github_url"] = github_url
@@ -89,24 +124,28 @@ def create_project_with_progress(title: str, description: str, personas: list, z
     try:
         # Create project
         with st.spinner("Creating project..."):
-            with get_client(timeout=600.0) as client:
+            with get_client(timeout=UPLOAD_TIMEOUT) as client:
                 logger.info(f"Sending project creation request to backend | user: {user_email}")
                 response = client.post("/projects/", data=data, files=files)
+                # The multipart body was streamed from the upload; drop the reference
+                # before the (long-lived) progress viewer renders.
+                files = None
                 response.raise_for_status()
-                project_data = response.json()
+                project_data = response_json(response)
         
+        invalidate_projects_cache()
+        # Reclaim the upload buffers before the progress viewer starts.
+        gc.collect(2)
         project_id = project_data.get('id')
         logger.info(f"Project created successfully | user: {user_email} | title: {title} | id: {project_id}")
         st.success(f"✅ Project '{title}' created! (ID: {project_id})")
         
-        # Show live progress monitoring
-        st.markdown("### 🔄 Live Processing Progress")
-        st.info("Watch your project being analyzed in real-time...")
-        
-        from components.progress_viewer import render_progress_viewer
-        render_progress_viewer(project_id, auto_close=True)
-        
-        st.success("🎉 All done! Go to the 'Your Projects' tab to see your project.")
+        # Rendered below the form by render_creation_progress (replacing the viewer
+        # of a previous creation).
+        previous_id = st.session_state.get('created_project_id')
+        if previous_id is not None and previous_id != project_id:
+            stop_progress_viewer(previous_id)
+        st.session_state['created_project_id'] = project_id
         
         return project_data
         
@@ -10,7 +10,8 @@ from __future__ import annotations
 import re
 import textwrap
 import io
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 import streamlit as st
 
@@ -23,9 +24,18 @@ from api.documentation import (
     delete_documentation,
 )
 from core.logging import get_logger
+from utils.config_helpers import config_summary
 
 logger = get_logger(__name__)
 
+# Markdown block patterns (matched against stripped lines, except bullets).
+_RE_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_RE_BULLET = re.compile(r"^\s*[-*+]\s+(.*)$")
+# Inline markdown for ReportLab: an XML special char, `code` or **bold**.
+_RE_INLINE = re.compile(r"([&<>])|`([^`]+)`|\*\*([^*]+)\*\*")
+_XML_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+_RE_XML_CHAR = re.compile(r"[&<>]")
+
 
 def render_documentation_tab():
     st.subheader("📄 Documentation")
@@ -62,22 +72,24 @@ def render_documentation_tab():
 
 
 def _render_project_selector(projects: List[Dict]) -> Optional[int]:
-    opts: List[Tuple[str, int]] = []
+    label_map: Dict[int, str] = {}
     for p in projects:
-        label = f"{p.get('title', 'Untitled')} (ID: {p.get('id')})"
-        if p.get("preprocessing_status") and p.get("preprocessing_status") != "completed":
-            label += f" [{p.get('preprocessing_status')}]"
-        opts.append((label, int(p["id"])))
-
-    labels = [o[0] for o in opts]
-    ids = [o[1] for o in opts]
+        pid = int(p["id"])
+        status = p.get("preprocessing_status")
+        suffix = f" [{status}]" if status and status != "completed" else ""
+        label_map[pid] = f"{p.get('title', 'Untitled')} (ID: {pid}){suffix}"
 
-    if st.session_state.get("doc_selected_project_id") not in ids:
+    ids = list(label_map)
+    if st.session_state.get("doc_selected_project_id") not in label_map:
         st.session_state["doc_selected_project_id"] = ids[0]
 
-    idx = ids.index(int(st.session_state["doc_selected_project_id"]))
-    selected_label = st.selectbox("Select Project", labels, index=idx, key="doc_project_select")
-    selected_id = ids[labels.index(selected_label)]
+    selected_id = st.selectbox(
+        "Select Project",
+        ids,
+        index=ids.index(int(st.session_state["doc_selected_project_id"])),
+        format_func=label_map.__getitem__,
+        key="doc_project_select",
+    )
     st.session_state["doc_selected_project_id"] = selected_id
     return selected_id
 
@@ -89,44 +101,47 @@ def _render_config_selector() -> Optional[int]:
         st.session_state["doc_selected_config_id"] = None
         return None
 
-    labels: List[str] = []
-    ids: List[int] = []
-    for cfg in configs:
-        if cfg.get("id") is None:
+    # One pass: lookup map plus the default configuration's ID.
+    cfg_by_id: Dict[int, Dict] = {}
+    default_id = None
+    for c in configs:
+        if c.get("id") is None:
             continue
-        cfg_id = int(cfg["id"])
-        labels.append(f"{'⭐ ' if cfg.get('is_default') else ''}{cfg.get('name','Untitled')} (ID: {cfg_id})")
-        ids.append(cfg_id)
-
-    if not ids:
+        cfg_id = int(c["id"])
+        cfg_by_id[cfg_id] = c
+        if default_id is None and c.get("is_default"):
+            default_id = cfg_id
+    if not cfg_by_id:
         st.session_state["doc_selected_config_id"] = None
         return None
 
-    default_id = next((int(c["id"]) for c in configs if c.get("is_default") and c.get("id") is not None), ids[0])
-    if st.session_state.get("doc_selected_config_id") not in ids:
-        st.session_state["doc_selected_config_id"] = default_id
+    ids = list(cfg_by_id)
+    if st.session_state.get("doc_selected_config_id") not in cfg_by_id:
+        st.session_state["doc_selected_config_id"] = default_id if default_id is not None else ids[0]
 
-    idx = ids.index(int(st.session_state["doc_selected_config_id"]))
-    selected_label = st.selectbox("Select Configuration", labels, index=idx, key="doc_config_select")
-    selected_id = ids[labels.index(selected_label)]
+    selected_id = st.selectbox(
+        "Select Configuration",
+        ids,
+        index=ids.index(int(st.session_state["doc_selected_config_id"])),
+        format_func=lambda cfg_id: f"{config_summary(cfg_by_id[cfg_id])[0]} (ID: {cfg_id})",
+        key="doc_config_select",
+    )
     st.session_state["doc_selected_config_id"] = selected_id
 
-    selected_cfg = next((c for c in configs if int(c.get("id", -1)) == selected_id), None)
-    if selected_cfg:
-        st.caption(
-            f"Depth: {selected_cfg.get('analysis_depth')} | "
-            f"Verbosity: {selected_cfg.get('doc_verbosity')} | "
-            f"Persona: {selected_cfg.get('persona_mode')}"
-        )
+    st.caption(config_summary(cfg_by_id[selected_id])[1])
     return selected_id
 
 
+@lru_cache(maxsize=16)
+def _default_persona_mode(persona_set: FrozenSet[str]) -> str:
+    """Persona mode preselected for a project's normalized personas."""
+    return "both" if {"sde", "pm"} <= persona_set else ("sde" if "sde" in persona_set else ("pm" if "pm" in persona_set else "both"))
+
+
 def _render_persona_selector(projects: List[Dict], project_id: int) -> str:
     proj = next((p for p in projects if int(p.get("id", -1)) == int(project_id)), {})
     personas = proj.get("personas") or []
-    # Normalize e.g. ["SDE","PM"] -> {"sde","pm"}
-    persona_set = {str(x).strip().lower() for x in personas if str(x).strip()}
-    default_mode = "both" if {"sde", "pm"} <= persona_set else ("sde" if "sde" in persona_set else ("pm" if "pm" in persona_set else "both"))
+    default_mode = _default_persona_mode(proj.get("persona_set", frozenset()))
 
     if st.session_state.get("doc_selected_persona_mode") not in ("sde", "pm", "both"):
         st.session_state["doc_selected_persona_mode"] = default_mode
@@ -161,8 +176,8 @@ def _render_generate_controls(project_id: int, config_id: Optional[int], persona
                 if result:
                     st.session_state["doc_current_doc_id"] = result.get("id")
                     st.session_state["doc_current_markdown"] = result.get("content_markdown", "") or ""
+                    # No rerun: the saved list and the viewer render below in this pass.
                     st.success("Documentation generated.")
-                    st.rerun()
             except Exception as e:
                 logger.error(f"Documentation generation failed: {e}", exc_info=True)
                 st.error(f"Failed to generate documentation: {e}")
@@ -176,33 +191,39 @@ def _render_saved_docs(project_id: int) -> None:
         return
 
     # Newest first
-    options: List[Tuple[str, int]] = []
+    label_map: Dict[int, str] = {}
+    docs_by_id: Dict[int, Dict] = {}
     for d in docs:
         doc_id = int(d["id"])
+        docs_by_id[doc_id] = d
         persona = d.get("persona_mode", "both")
         cfg_id = d.get("analysis_config_id")
         created = d.get("created_at", "")
-        label = f"Doc {doc_id} | persona={persona} | cfg={cfg_id if cfg_id is not None else 'default'} | {created}"
-        options.append((label, doc_id))
-
-    labels = [o[0] for o in options]
-    ids = [o[1] for o in options]
+        label_map[doc_id] = f"Doc {doc_id} | persona={persona} | cfg={cfg_id if cfg_id is not None else 'default'} | {created}"
 
-    if st.session_state.get("doc_current_doc_id") not in ids:
+    ids = list(label_map)
+    if st.session_state.get("doc_current_doc_id") not in label_map:
         st.session_state["doc_current_doc_id"] = ids[0]
 
-    idx = ids.index(int(st.session_state["doc_current_doc_id"]))
-    selected_label = st.selectbox("Select saved documentation", labels, index=idx, key="doc_saved_select")
-    selected_id = ids[labels.index(selected_label)]
+    selected_id = st.selectbox(
+        "Select saved documentation",
+        ids,
+        index=ids.index(int(st.session_state["doc_current_doc_id"])),
+        format_func=label_map.__getitem__,
+        key="doc_saved_select",
+    )
 
     colA, colB = st.columns([1, 1])
     with colA:
         if st.button("Load", use_container_width=True):
-            doc = get_documentation(selected_id)
+            # The list response already carries each document's markdown, so loading
+            # only fetches when it is missing.
+            doc = docs_by_id[selected_id]
+            if doc.get("content_markdown") is None:
+                doc = get_documentation(selected_id)
             if doc:
                 st.session_state["doc_current_doc_id"] = selected_id
                 st.session_state["doc_current_markdown"] = doc.get("content_markdown", "") or ""
-                st.rerun()
     with colB:
         if st.button("Delete", use_container_width=True):
             if delete_documentation(selected_id):
@@ -210,6 +231,7 @@ def _render_saved_docs(project_id: int) -> None:
                     st.session_state["doc_current_doc_id"] = None
                     st.session_state["doc_current_markdown"] = ""
                 st.success("Deleted.")
+                # The selector above still lists the deleted doc; rerun to rebuild it.
                 st.rerun()
 
 
@@ -224,18 +246,39 @@ def _render_doc_viewer_and_export() -> None:
 
     st.markdown("### Export")
     st.caption("Export uses the currently displayed documentation.")
-    try:
-        pdf_bytes = _markdown_to_pdf_bytes(md)
-        st.download_button(
-            label="Download PDF",
-            data=pdf_bytes,
-            file_name=f"{_safe_filename('documentation')}.pdf",
-            mime="application/pdf",
-            use_container_width=True,
-        )
-    except Exception as e:
-        logger.error(f"PDF export failed: {e}", exc_info=True)
-        st.error(f"PDF export failed: {e}")
+    # The PDF is built only on request; the download button appears once it exists
+    # for the displayed document.
+    pdf_bytes = _ready_doc_pdf(md)
+    if pdf_bytes is None:
+        if not st.button("Prepare PDF", use_container_width=True, key="doc_prepare_pdf"):
+            return
+        try:
+            with st.spinner("Preparing PDF..."):
+                pdf_bytes = _markdown_to_pdf_bytes(md)
+        except Exception as e:
+            logger.error(f"PDF export failed: {e}", exc_info=True)
+            st.error(f"PDF export failed: {e}")
+            return
+        st.session_state["doc_pdf_last"] = (md, pdf_bytes)
+    st.download_button(
+        label="Download PDF",
+        data=pdf_bytes,
+        file_name=f"{_safe_filename('documentation')}.pdf",
+        mime="application/pdf",
+        use_container_width=True,
+    )
+
+
+def _ready_doc_pdf(md: str) -> Optional[bytes]:
+    """
+    PDF already prepared for the displayed markdown, if any. Reruns that leave the
+    document unchanged see the very same string object in session_state, so an
+    identity check suffices.
+    """
+    last = st.session_state.get("doc_pdf_last")
+    if last is not None and last[0] is md:
+        return last[1]
+    return None
 
 
 def _safe_filename(text: str) -> str:
@@ -267,9 +310,11 @@ def _markdown_to_plain_text(markdown: str) -> str:
     return out
 
 
+@st.cache_data(max_entries=8, show_spinner=False)
 def _markdown_to_pdf_bytes(markdown: str) -> bytes:
     """
     Create a PDF from markdown using ReportLab (reliable, non-blank).
+    Cached per markdown string, so reruns reuse the built PDF.
     """
     try:
         return _markdown_to_pdf_bytes_reportlab(markdown)
@@ -279,37 +324,19 @@ def _markdown_to_pdf_bytes(markdown: str) -> bytes:
         return _text_to_pdf_bytes(text)
 
 
-def _markdown_to_pdf_bytes_reportlab(markdown: str) -> bytes:
-    from reportlab.lib.pagesizes import letter
+@lru_cache(maxsize=1)
+def _reportlab_styles() -> Dict[str, object]:
+    """
+    Paragraph styles for the PDF export, built once per process
+    (getSampleStyleSheet() constructs the whole sample stylesheet on every call).
+    """
     from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Preformatted, ListFlowable, ListItem
     from reportlab.lib import colors
 
-    buf = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buf,
-        pagesize=letter,
-        leftMargin=0.75 * inch,
-        rightMargin=0.75 * inch,
-        topMargin=0.75 * inch,
-        bottomMargin=0.75 * inch,
-        title="Documentation",
-    )
-
     styles = getSampleStyleSheet()
     style_body = styles["BodyText"]
     style_body.wordWrap = "CJK"
 
-    style_h = {
-        1: styles["Heading1"],
-        2: styles["Heading2"],
-        3: styles["Heading3"],
-        4: styles["Heading4"],
-        5: styles["Heading5"],
-        6: styles["Heading6"],
-    }
-
     code_style = ParagraphStyle(
         name="CodeBlock",
         parent=styles["Code"],
@@ -325,6 +352,22 @@ def _markdown_to_pdf_bytes_reportlab(markdown: str) -> bytes:
         spaceBefore=6,
         spaceAfter=6,
     )
+    return {
+        "body": style_body,
+        "code": code_style,
+        "h": {level: styles[f"Heading{level}"] for level in range(1, 7)},
+    }
+
+
+def _markdown_to_pdf_bytes_reportlab(markdown: str) -> bytes:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Preformatted, ListFlowable, ListItem
+
+    styles = _reportlab_styles()
+    style_body = styles["body"]
+    style_h = styles["h"]
+    code_style = styles["code"]
 
     story: List[object] = []
 
@@ -347,7 +390,7 @@ def _markdown_to_pdf_bytes_reportlab(markdown: str) -> bytes:
         if btype == "heading":
             flush_bullets()
             lvl = int(level or 2)
-            story.append(Paragraph(_md_inline_to_rl_html(content.strip()), style_h.get(lvl, styles["Heading2"])))
+            story.append(Paragraph(_md_inline_to_rl_html(content.strip()), style_h.get(lvl, style_h[2])))
             story.append(Spacer(1, 6))
             continue
 
@@ -369,8 +412,21 @@ def _markdown_to_pdf_bytes_reportlab(markdown: str) -> bytes:
 
     flush_bullets()
 
-    doc.build(story)
-    return buf.getvalue()
+    # getvalue() hands over the buffer's bytes without copying them (CPython shares
+    # the internal object), and closing the buffer drops its reference, so the PDF
+    # is held once — by the caller's cache.
+    with io.BytesIO() as buf:
+        doc = SimpleDocTemplate(
+            buf,
+            pagesize=letter,
+            leftMargin=0.75 * inch,
+            rightMargin=0.75 * inch,
+            topMargin=0.75 * inch,
+            bottomMargin=0.75 * inch,
+            title="Documentation",
+        )
+        doc.build(story)
+        return buf.getvalue()
 
 
 def _md_inline_to_rl_html(text: str) -> str:
@@ -379,399 +435,97 @@ def _md_inline_to_rl_html(text: str) -> str:
     Supports:
     - **bold**
     - `code`
+    Escaping and both conversions happen in a single scan.
     """
-    # Escape XML-ish chars first
-    text = (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-    )
-    # Inline code: `...`
-    text = re.sub(r"`([^`]+)`", r"<font face=\"Courier\">\1</font>", text)
-    # Bold: **...**
-    text = re.sub(r"\*\*([^*]+)\*\*", r"<b>\1</b>", text)
-    return text
-
-
-class _Run:
-    __slots__ = ("text", "font", "size")
+    return _RE_INLINE.sub(_inline_to_rl_html, text)
 
-    def __init__(self, text: str, font: str, size: int):
-        self.text = text
-        self.font = font
-        self.size = size
 
+def _inline_to_rl_html(m: "re.Match[str]") -> str:
+    char, code, bold = m.groups()
+    if char is not None:
+        return _XML_ESCAPES[char]
+    if code is not None:
+        # Markdown markers inside code spans are shown literally.
+        escaped = _RE_XML_CHAR.sub(lambda c: _XML_ESCAPES[c.group()], code)
+        return f'<font face="Courier">{escaped}</font>'
+    # Bold text may itself contain `code`
+    return f"<b>{_RE_INLINE.sub(_inline_to_rl_html, bold)}</b>"
 
-def _markdown_to_pdf_bytes_formatted(markdown: str) -> bytes:
-    page_w, page_h = 612, 792  # Letter
-    margin = 72
-    max_w = page_w - 2 * margin
-
-    # Fonts (standard PDF fonts)
-    FONT_REG = "F1"  # Helvetica
-    FONT_BOLD = "F2"  # Helvetica-Bold
-    FONT_CODE = "F3"  # Courier
-
-    base_size = 11
-    heading_sizes = {1: 20, 2: 16, 3: 14, 4: 12, 5: 11, 6: 11}
-    leading = 14
-    code_leading = 14
-
-    lines: List[List[_Run]] = []
-    for btype, content, level in _parse_markdown_blocks(markdown):
-        if btype == "blank":
-            if lines and lines[-1]:
-                lines.append([])
-            continue
-
-        if btype == "heading":
-            size = heading_sizes.get(int(level or 2), 16)
-            if lines and lines[-1]:
-                lines.append([])
-            lines.extend(_wrap_runs([_Run(content.strip(), FONT_BOLD, size)], max_w))
-            lines.append([])
-            continue
-
-        if btype == "codeblock":
-            if lines and lines[-1]:
-                lines.append([])
-            for ln in (content or "").splitlines() or [""]:
-                # No wrapping for code; keep as-is (but still fit on page with crude wrap if extremely long)
-                lines.extend(_wrap_runs([_Run(ln, FONT_CODE, base_size)], max_w))
-            lines.append([])
-            continue
 
-        if btype == "bullet":
-            runs = [_Run("- ", FONT_REG, base_size)] + _text_to_styled_runs(
-                content.strip(), base_size, FONT_REG, FONT_BOLD, FONT_CODE
-            )
-            lines.extend(_wrap_runs(runs, max_w))
-            lines.append([])
-            continue
-
-        if btype == "paragraph":
-            runs = _text_to_styled_runs(content.strip(), base_size, FONT_REG, FONT_BOLD, FONT_CODE)
-            if runs:
-                lines.extend(_wrap_runs(runs, max_w))
-                lines.append([])
-            continue
-
-    # Trim trailing empty lines
-    while lines and not lines[-1]:
-        lines.pop()
-
-    return _runs_to_pdf_bytes(
-        lines=lines,
-        page_w=page_w,
-        page_h=page_h,
-        margin=margin,
-        leading=leading,
-        code_leading=code_leading,
-        fonts={
-            FONT_REG: "Helvetica",
-            FONT_BOLD: "Helvetica-Bold",
-            FONT_CODE: "Courier",
-        },
-    )
-
-
-def _text_to_styled_runs(
-    text: str,
-    base_size: int,
-    font_reg: str,
-    font_bold: str,
-    font_code: str,
-) -> List[_Run]:
-    # Very small inline parser:
-    # - **bold**
-    # - `code`
-    out: List[_Run] = []
-    i = 0
-    bold = False
-    code = False
-    buf: List[str] = []
-
-    def flush():
-        nonlocal buf
-        if not buf:
-            return
-        s = "".join(buf)
-        buf = []
-        if s:
-            font = font_code if code else (font_bold if bold else font_reg)
-            out.append(_Run(s, font, base_size))
-
-    while i < len(text):
-        if text.startswith("**", i):
-            flush()
-            bold = not bold
-            i += 2
-            continue
-        if text[i] == "`":
-            flush()
-            code = not code
-            i += 1
-            continue
-        buf.append(text[i])
-        i += 1
-    flush()
-    return out
-
-
-def _parse_markdown_blocks(markdown: str) -> List[Tuple[str, str, int]]:
+@lru_cache(maxsize=32)
+def _parse_markdown_blocks(markdown: str) -> Tuple[Tuple[str, str, int], ...]:
     """
     Parse markdown into blocks without external deps.
-    Returns list of (block_type, content, level).
+    Returns a tuple of (block_type, content, level), memoized per markdown string
+    (the result is immutable so cached parses can be shared).
     block_type: heading|paragraph|bullet|codeblock|blank
     """
     lines = markdown.splitlines()
     out: List[Tuple[str, str, int]] = []
+    heading_match = _RE_HEADING.match
+    bullet_match = _RE_BULLET.match
+    n = len(lines)
     i = 0
 
-    def is_heading(s: str) -> Optional[Tuple[int, str]]:
-        m = re.match(r"^(#{1,6})\s+(.*)$", s)
-        if not m:
-            return None
-        return (len(m.group(1)), m.group(2))
-
-    def is_bullet(s: str) -> Optional[str]:
-        m = re.match(r"^\s*[-*+]\s+(.*)$", s)
-        return m.group(1) if m else None
-
-    while i < len(lines):
+    while i < n:
         line = lines[i]
+        stripped = line.strip()
 
-        if line.strip() == "":
+        if not stripped:
             out.append(("blank", "", 0))
             i += 1
             continue
 
-        if line.lstrip().startswith("```"):
-            fence = line.lstrip()
+        if stripped.startswith("```"):
             i += 1
             code_lines: List[str] = []
-            while i < len(lines) and not lines[i].lstrip().startswith("```"):
+            while i < n and not lines[i].lstrip().startswith("```"):
                 code_lines.append(lines[i])
                 i += 1
             # skip closing fence if present
-            if i < len(lines) and lines[i].lstrip().startswith("```"):
+            if i < n:
                 i += 1
             out.append(("codeblock", "\n".join(code_lines), 0))
             continue
 
-        hd = is_heading(line.strip())
+        # Cheap first-character checks before the regexes.
+        hd = heading_match(stripped) if stripped[0] == "#" else None
         if hd:
-            lvl, txt = hd
-            out.append(("heading", txt.strip(), lvl))
+            out.append(("heading", hd.group(2).strip(), len(hd.group(1))))
             i += 1
             continue
 
-        b = is_bullet(line)
+        b = bullet_match(line) if stripped[0] in "-*+" else None
         if b is not None:
-            out.append(("bullet", b.strip(), 0))
+            out.append(("bullet", b.group(1).strip(), 0))
             i += 1
             continue
 
         # paragraph: collect until blank or special
-        para: List[str] = [line.strip()]
+        para: List[str] = [stripped]
         i += 1
-        while i < len(lines):
-            nxt = lines[i]
-            if nxt.strip() == "":
-                break
-            if nxt.lstrip().startswith("```"):
+        while i < n:
+            nxt = lines[i].strip()
+            if not nxt or nxt.startswith("```"):
                 break
-            if is_heading(nxt.strip()):
+            first = nxt[0]
+            if first == "#" and heading_match(nxt):
                 break
-            if is_bullet(nxt) is not None:
+            if first in "-*+" and bullet_match(lines[i]):
                 break
-            para.append(nxt.strip())
+            para.append(nxt)
             i += 1
         out.append(("paragraph", " ".join(para).strip(), 0))
 
-    return out
+    return tuple(out)
 
 
-def _wrap_runs(runs: List[_Run], max_w: float) -> List[List[_Run]]:
-    """
-    Wrap runs into lines, approximating character widths.
-    Splits only on spaces for simplicity.
-    """
-    lines: List[List[_Run]] = []
-    cur: List[_Run] = []
-    cur_w = 0.0
-
-    def run_width(r: _Run) -> float:
-        # crude width approximation per font
-        per = 0.55
-        if r.font == "F2":
-            per = 0.58
-        elif r.font == "F3":
-            per = 0.60
-        return len(r.text) * r.size * per
-
-    def flush():
-        nonlocal cur, cur_w
-        lines.append(cur)
-        cur = []
-        cur_w = 0.0
-
-    # Expand runs into space-separated chunks while keeping style
-    chunks: List[_Run] = []
-    for r in runs:
-        if r.text == "\n":
-            chunks.append(r)
-            continue
-        # preserve spaces as separators
-        parts = re.split(r"(\s+)", r.text)
-        for p in parts:
-            if p == "":
-                continue
-            chunks.append(_Run(p, r.font, r.size))
-
-    for ch in chunks:
-        if ch.text == "\n":
-            if cur or (lines and lines[-1]):
-                flush()
-            else:
-                lines.append([])
-            continue
-
-        w = run_width(ch)
-        if cur and cur_w + w > max_w and not ch.text.isspace():
-            flush()
-        cur.append(ch)
-        cur_w += w
-
-    if cur:
-        flush()
-
-    # Trim trailing whitespace-only runs per line
-    for ln in lines:
-        while ln and ln[-1].text.isspace():
-            ln.pop()
-    return lines
-
-
-def _runs_to_pdf_bytes(
-    *,
-    lines: List[List[_Run]],
-    page_w: int,
-    page_h: int,
-    margin: int,
-    leading: int,
-    code_leading: int,
-    fonts: Dict[str, str],
-) -> bytes:
-    max_lines_per_page = int((page_h - 2 * margin) / leading)
-    if max_lines_per_page <= 0:
-        max_lines_per_page = 1
-
-    pages: List[List[List[_Run]]] = []
-    for i in range(0, len(lines), max_lines_per_page):
-        pages.append(lines[i : i + max_lines_per_page])
-    if not pages:
-        pages = [[[]]]
-
-    def esc_pdf(s: str) -> str:
-        return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
-
-    # Objects: 1 catalog, 2 pages, 3+ fonts, then page/content objects
-    objects: List[bytes] = [b""]
-    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
-    objects.append(b"")  # pages placeholder
-
-    font_obj_ids: Dict[str, int] = {}
-    for name, base in fonts.items():
-        font_obj_ids[name] = len(objects)
-        objects.append((f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} >>").encode("ascii"))
-
-    page_obj_ids: List[int] = []
-
-    for page_lines in pages:
-        # Build content stream for this page
-        y_start = page_h - margin
-        stream_parts: List[str] = []
-        stream_parts.append("BT")
-        stream_parts.append(f"{margin} {y_start} Td")
-        stream_parts.append(f"{leading} TL")
-
-        first_line = True
-        for ln in page_lines:
-            if not first_line:
-                stream_parts.append("T*")
-            first_line = False
-
-            # Start each line at left margin
-            stream_parts.append(f"{-9999} 0 Td")  # reset hack
-            stream_parts.append(f"{9999} 0 Td")   # reset hack
-            stream_parts.append(f"{-9999} 0 Td")
-            stream_parts.append(f"{9999} 0 Td")
-            # Actually reset by setting absolute position via Tm
-            # (a reliable reset, independent of the above)
-            stream_parts.append(f"1 0 0 1 {margin} 0 Tm")
-
-            x_adv = 0.0
-            for r in ln:
-                txt = esc_pdf(r.text)
-                # Select font
-                stream_parts.append(f"/{r.font} {r.size} Tf")
-                # Move to x offset on the current line
-                stream_parts.append(f"1 0 0 1 {margin + x_adv} 0 Tm")
-                stream_parts.append(f"({txt}) Tj")
-                # Advance (approx)
-                per = 0.55
-                if r.font == "F2":
-                    per = 0.58
-                elif r.font == "F3":
-                    per = 0.60
-                x_adv += len(r.text) * r.size * per
-
-        stream_parts.append("ET")
-        stream = ("\n".join(stream_parts) + "\n").encode("utf-8")
-
-        content_id = len(objects)
-        objects.append(b"<< /Length " + str(len(stream)).encode("ascii") + b" >>\nstream\n" + stream + b"endstream")
-
-        page_id = len(objects)
-        page_obj_ids.append(page_id)
-
-        # Font resources
-        font_map = " ".join([f"/{fname} {obj_id} 0 R" for fname, obj_id in font_obj_ids.items()]).encode("ascii")
-        objects.append(
-            b"<< /Type /Page /Parent 2 0 R "
-            b"/MediaBox [0 0 612 792] "
-            + b"/Resources << /Font << " + font_map + b" >> >> "
-            + b"/Contents " + str(content_id).encode("ascii") + b" 0 R >>"
-        )
-
-    kids = " ".join([f"{pid} 0 R" for pid in page_obj_ids]).encode("ascii")
-    objects[2] = b"<< /Type /Pages /Kids [ " + kids + b" ] /Count " + str(len(page_obj_ids)).encode("ascii") + b" >>"
-
-    # Emit PDF + xref
-    out = bytearray()
-    out.extend(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
-
-    offsets: List[int] = [0]
-    for obj_id in range(1, len(objects)):
-        offsets.append(len(out))
-        out.extend(f"{obj_id} 0 obj\n".encode("ascii"))
-        out.extend(objects[obj_id])
-        out.extend(b"\nendobj\n")
-
-    xref_start = len(out)
-    out.extend(b"xref\n")
-    out.extend(f"0 {len(objects)}\n".encode("ascii"))
-    out.extend(b"0000000000 65535 f \n")
-    for obj_id in range(1, len(objects)):
-        out.extend(f"{offsets[obj_id]:010d} 00000 n \n".encode("ascii"))
-
-    out.extend(b"trailer\n")
-    out.extend(b"<< /Size " + str(len(objects)).encode("ascii") + b" /Root 1 0 R >>\n")
-    out.extend(b"startxref\n")
-    out.extend(f"{xref_start}\n".encode("ascii"))
-    out.extend(b"%%EOF\n")
-    return bytes(out)
+# Rough wrap for the plain-text fallback (Helvetica ~ 0.55em avg width); one wrapper
+# for all paragraphs instead of a new TextWrapper per `textwrap.wrap` call.
+_TEXT_WRAP_WIDTH = 90
+_TEXT_WRAPPER = textwrap.TextWrapper(width=_TEXT_WRAP_WIDTH, replace_whitespace=False, drop_whitespace=False)
+# PDF literal-string escapes, applied in one pass.
+_PDF_STRING_ESCAPES = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)"})
 
 
 def _text_to_pdf_bytes(text: str) -> bytes:
@@ -782,14 +536,15 @@ def _text_to_pdf_bytes(text: str) -> bytes:
     leading = 14
     max_lines_per_page = int((page_h - 2 * margin) / leading)
 
-    # Rough wrap (Helvetica ~ 0.55em avg width)
-    wrap_width = 90
     raw_lines: List[str] = []
     for para in text.splitlines():
         if not para.strip():
             raw_lines.append("")
-            continue
-        raw_lines.extend(textwrap.wrap(para, width=wrap_width, replace_whitespace=False, drop_whitespace=False))
+        elif len(para) <= _TEXT_WRAP_WIDTH and "\t" not in para:
+            # Fits on one line: the wrapper would return it unchanged.
+            raw_lines.append(para)
+        else:
+            raw_lines.extend(_TEXT_WRAPPER.wrap(para))
 
     pages: List[List[str]] = []
     for i in range(0, len(raw_lines), max_lines_per_page):
@@ -797,9 +552,6 @@ def _text_to_pdf_bytes(text: str) -> bytes:
     if not pages:
         pages = [[""]]
 
-    def esc(s: str) -> str:
-        return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
-
     objects: List[bytes] = [b""]  # obj 0 placeholder
 
     # 1: catalog, 2: pages, 3: font
@@ -828,7 +580,7 @@ def _text_to_pdf_bytes(text: str) -> bytes:
             if not first:
                 stream_lines.append("T*")
             first = False
-            stream_lines.append(f"({esc(ln)}) Tj")
+            stream_lines.append(f"({ln.translate(_PDF_STRING_ESCAPES)}) Tj")
         stream_lines.append("ET")
         stream = ("\n".join(stream_lines) + "\n").encode("utf-8")
         objects.append(
@@ -861,28 +613,29 @@ def _text_to_pdf_bytes(text: str) -> bytes:
     kids = " ".join([f"{pid} 0 R" for pid in page_obj_ids]).encode("ascii")
     objects[2] = b"<< /Type /Pages /Kids [ " + kids + b" ] /Count " + str(len(page_obj_ids)).encode("ascii") + b" >>"
 
-    # Build full PDF with xref
-    out = bytearray()
-    out.extend(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    # Build full PDF with xref: collect the parts and join once, tracking the byte
+    # offsets for the xref table as they are appended.
+    out: List[bytes] = [b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"]
+    pos = len(out[0])
 
     offsets: List[int] = [0]
     for i in range(1, len(objects)):
-        offsets.append(len(out))
-        out.extend(f"{i} 0 obj\n".encode("ascii"))
-        out.extend(objects[i])
-        out.extend(b"\nendobj\n")
-
-    xref_start = len(out)
-    out.extend(b"xref\n")
-    out.extend(f"0 {len(objects)}\n".encode("ascii"))
-    out.extend(b"0000000000 65535 f \n")
+        offsets.append(pos)
+        header = f"{i} 0 obj\n".encode("ascii")
+        out += (header, objects[i], b"\nendobj\n")
+        pos += len(header) + len(objects[i]) + 8
+
+    xref_start = pos
+    out.append(b"xref\n")
+    out.append(f"0 {len(objects)}\n".encode("ascii"))
+    out.append(b"0000000000 65535 f \n")
     for i in range(1, len(objects)):
-        out.extend(f"{offsets[i]:010d} 00000 n \n".encode("ascii"))
-
-    out.extend(b"trailer\n")
-    out.extend(b"<< /Size " + str(len(objects)).encode("ascii") + b" /Root 1 0 R >>\n")
-    out.extend(b"startxref\n")
-    out.extend(f"{xref_start}\n".encode("ascii"))
-    out.extend(b"%%EOF\n")
-    return bytes(out)
+        out.append(f"{offsets[i]:010d} 00000 n \n".encode("ascii"))
+
+    out.append(b"trailer\n")
+    out.append(b"<< /Size " + str(len(objects)).encode("ascii") + b" /Root 1 0 R >>\n")
+    out.append(b"startxref\n")
+    out.append(f"{xref_start}\n".encode("ascii"))
+    out.append(b"%%EOF\n")
+    return b"".join(out)
 
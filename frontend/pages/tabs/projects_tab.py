@@ -2,58 +2,94 @@
 Projects tab component.
 """
 import streamlit as st
-import time
-from api.projects import get_projects, delete_project, get_project_analysis
+from api.projects import ProjectView, get_project_views, delete_project, get_project_analysis
+from components.progress_viewer import (
+    fetch_all_progress,
+    render_progress_viewer,
+    show_progress_indicator,
+    stop_progress_viewer,
+)
+
+
+# Project cards listed per page; more are added with "Show more".
+PROJECTS_PAGE_SIZE = 20
+
+# Dependencies listed in the detailed analysis; longer lists are offered as a download.
+DEPENDENCIES_SHOWN = 200
+
+_STATUS_EMOJI = {
+    'completed': '✅',
+    'processing': '⚙️',
+    'failed': '❌',
+    'pending': '⏳'
+}
+
+# "Source" line per (upper-cased) source type; other types use the generic form.
+_SOURCE_FORMATS = {
+    'ZIP': "**Source:** 📦 ZIP File - `{value}`",
+    'GITHUB': "**Source:** 🐙 GitHub - [{value}]({value})",
+}
+
+
+def _project_ui(project_id) -> dict:
+    """
+    Per-project UI flags ('live', 'analysis', 'confirm_delete'), kept in one
+    session_state dict instead of a key per flag and project.
+    """
+    return st.session_state.setdefault('project_ui', {}).setdefault(project_id, {})
 
 
 def render_projects_tab():
     """Render the projects list tab"""
     st.subheader("Your Projects")
-    projects = get_projects()
+    projects = get_project_views()
 
     if projects:
-        for project in projects:
-            render_project_card(project)
+        shown = st.session_state.get('projects_shown', PROJECTS_PAGE_SIZE)
+        visible = projects[:shown]
+        # One concurrent batch for every open card still processing, instead of a
+        # progress request per card.
+        processing_ids = [
+            p.id for p in visible
+            if p.status == 'processing' and st.session_state.get(f"open_project_{p.id}")
+        ]
+        progress_by_id = {}
+        if processing_ids:
+            progress_by_id = fetch_all_progress(processing_ids)
+        for project in visible:
+            render_project_card(project, progress_by_id.get(project.id))
+
+        if len(projects) > shown:
+            if st.button(f"Show more ({len(projects) - shown} more)", key="projects_more"):
+                st.session_state['projects_shown'] = shown + PROJECTS_PAGE_SIZE
+                st.rerun()
     else:
         st.info("You don't have any projects yet. Create one!")
 
 
-def render_project_card(project):
-    """Render a single project card"""
+def render_project_card(project: ProjectView, progress=None):
+    """Render a single project card (`progress`: pre-fetched progress payload)"""
+    pid = project.id
     # Get processing status indicator
-    status = project.get('preprocessing_status', 'pending')
-    status_emoji = {
-        'completed': '✅',
-        'processing': '⚙️',
-        'failed': '❌',
-        'pending': '⏳'
-    }.get(status, '⏳')
+    status = project.status
+    status_emoji = _STATUS_EMOJI.get(status, '⏳')
     
-    # Display project with status indicator
-    with st.expander(f"{status_emoji} **{project['title']}** (ID: {project['id']})"):
-        st.write(f"**Description:** {project.get('description') or 'None'}")
+    # Display project with status indicator. Unlike an expander (whose body runs even
+    # when collapsed), the body below is only built while the card is open.
+    if not st.toggle(f"{status_emoji} **{project.title}** (ID: {pid})", key=f"open_project_{pid}"):
+        return
+    with st.container(border=True):
+        st.write(f"**Description:** {project.description or 'None'}")
         
         # Display Repository Intelligence
-        if status == 'completed' and project.get('repository_type'):
+        if status == 'completed' and project.repository_type:
             render_repository_intelligence(project)
         elif status == 'processing':
             st.info("⚙️ Repository analysis in progress...")
+            if progress is not None:
+                show_progress_indicator(pid, data=progress)
             
-            # Show live progress button
-            if st.button(f"👁️ Watch Live Progress", key=f"watch_live_{project['id']}"):
-                st.session_state[f'show_live_progress_{project["id"]}'] = True
-                st.rerun()
-            
-            # Show progress viewer if requested
-            if st.session_state.get(f'show_live_progress_{project["id"]}', False):
-                st.markdown("---")
-                st.markdown("### 🔄 Live Progress Monitor")
-                from components.progress_viewer import render_progress_viewer
-                render_progress_viewer(project['id'], auto_close=False)
-                
-                if st.button("❌ Stop Monitoring", key=f"stop_monitor_{project['id']}"):
-                    st.session_state[f'show_live_progress_{project["id"]}'] = False
-                    st.rerun()
+            _live_progress_fragment(pid)
         elif status == 'failed':
             st.error("❌ Preprocessing failed. Please try reprocessing.")
         elif status == 'pending':
@@ -66,148 +102,176 @@ def render_project_card(project):
         render_delete_section(project)
 
 
-def render_repository_intelligence(project):
+def render_repository_intelligence(project: ProjectView):
     """Render repository intelligence section"""
     st.markdown("### 🔍 Repository Intelligence")
     
-    # Main info in columns
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        repo_type = project.get('repository_type', 'Unknown')
-        st.metric("Type", repo_type)
-    with col2:
-        framework = project.get('framework', 'None detected')
-        st.metric("Framework", framework.capitalize() if framework else 'N/A')
-    with col3:
-        total_files = project.get('total_files', 0)
-        st.metric("Files", total_files)
-    
-    # Stats row
-    col4, col5, col6 = st.columns(3)
-    with col4:
-        loc = project.get('total_lines_of_code', 0)
-        st.metric("Lines of Code", f"{loc:,}")
-    with col5:
-        endpoints = project.get('api_endpoints_count', 0)
-        st.metric("API Endpoints", endpoints)
-    with col6:
-        models = project.get('models_count', 0)
-        st.metric("Models", models)
+    # Main info and stats as one markdown table (a single element instead of six metrics)
+    framework = project.framework.capitalize() if project.framework else 'N/A'
+    if project.total_files or project.total_lines_of_code or project.api_endpoints_count:
+        st.markdown(
+            "| Type | Framework | Files | Lines of Code | API Endpoints | Models |\n"
+            "|---|---|---|---|---|---|\n"
+            f"| {project.repository_type} | {framework} | {project.total_files} "
+            f"| {project.total_lines_of_code:,} | {project.api_endpoints_count} | {project.models_count} |"
+        )
+    else:
+        # No stats collected: skip the zero-filled table, keep type and framework.
+        st.markdown(f"**Type:** {project.repository_type} · **Framework:** {framework}")
     
-    # Language breakdown
-    languages = project.get('languages_breakdown', {})
+    # Language breakdown, on one line
+    languages = project.languages_breakdown
     if languages:
-        st.markdown("**Language Breakdown:**")
-        lang_cols = st.columns(len(languages))
-        for idx, (lang, pct) in enumerate(languages.items()):
-            with lang_cols[idx]:
-                st.write(f"**{lang.capitalize()}:** {pct}%")
+        st.markdown("**Language Breakdown:** " + " · ".join(
+            f"**{lang.capitalize()}:** {pct}%" for lang, pct in languages.items()
+        ))
     
     # Entry points
-    entry_points = project.get('entry_points', [])
+    entry_points = project.entry_points
     if entry_points:
         st.markdown(f"**🎯 Entry Points:** `{', '.join(entry_points)}`")
     
     # Dependencies (show first 5)
-    deps = project.get('dependencies', [])
+    deps = project.dependencies
     if deps:
         deps_display = ', '.join(deps[:5])
         more_text = f" (+{len(deps) - 5} more)" if len(deps) > 5 else ""
         st.markdown(f"**📦 Dependencies:** `{deps_display}{more_text}`")
     
+    _detailed_analysis_fragment(project)
+    
+    st.divider()
+
+
+# The live monitor and the detailed analysis are fragments: their buttons (and the
+# monitor's refreshes) rerun only that block, not the whole projects tab.
+@st.fragment
+def _live_progress_fragment(project_id):
+    """Watch/stop buttons and the live progress monitor for a processing project"""
+    # Show live progress button
+    if st.button(f"👁️ Watch Live Progress", key=f"watch_live_{project_id}"):
+        _project_ui(project_id)['live'] = True
+        st.rerun(scope="fragment")
+    
+    # Show progress viewer if requested
+    if _project_ui(project_id).get('live', False):
+        st.markdown("---")
+        st.markdown("### 🔄 Live Progress Monitor")
+        render_progress_viewer(project_id, auto_close=False)
+        
+        if st.button("❌ Stop Monitoring", key=f"stop_monitor_{project_id}"):
+            stop_progress_viewer(project_id)
+            _project_ui(project_id)['live'] = False
+            st.rerun(scope="fragment")
+
+
+@st.fragment
+def _detailed_analysis_fragment(project: ProjectView):
+    """View button and (when requested) the detailed analysis of a project"""
+    pid = project.id
     # View detailed analysis button
-    if st.button(f"📊 View Detailed Analysis", key=f"analysis_{project['id']}"):
-        st.session_state[f'show_analysis_{project["id"]}'] = True
-        st.rerun()
+    if st.button(f"📊 View Detailed Analysis", key=f"analysis_{pid}"):
+        _project_ui(pid)['analysis'] = True
+        st.rerun(scope="fragment")
     
     # Show detailed analysis if requested
-    if st.session_state.get(f'show_analysis_{project["id"]}', False):
+    if _project_ui(pid).get('analysis', False):
         render_detailed_analysis(project)
-    
-    st.divider()
 
 
-def render_detailed_analysis(project):
+def render_detailed_analysis(project: ProjectView):
     """Render detailed repository analysis"""
+    pid = project.id
     with st.container():
         st.markdown("#### 📊 Detailed Repository Analysis")
         
-        analysis = get_project_analysis(project['id'])
+        analysis = get_project_analysis(pid)
         if analysis:
-            # Architecture
+            # Architecture, language, endpoints and models as one markdown block
+            parts = []
             if analysis.get('architecture'):
-                st.write(f"**🏗️ Architecture:** {analysis['architecture']}")
-            
-            # Primary Language
+                parts.append(f"**🏗️ Architecture:** {analysis['architecture']}")
             if analysis.get('primary_language'):
-                st.write(f"**💻 Primary Language:** {analysis['primary_language'].capitalize()}")
-            
-            # API Endpoints Details
+                parts.append(f"**💻 Primary Language:** {analysis['primary_language'].capitalize()}")
             endpoints = analysis.get('api_endpoints_details', [])
             if endpoints:
-                st.markdown("**🔗 API Endpoints:**")
-                for ep in endpoints[:5]:
-                    st.write(f"- `{ep.get('method')}` {ep.get('path')} (`{ep.get('file')}`)")
-            
-            # Models
+                parts.append("**🔗 API Endpoints:**\n" + "\n".join(
+                    f"- `{ep.get('method')}` {ep.get('path')} (`{ep.get('file')}`)" for ep in endpoints[:5]
+                ))
             models = analysis.get('models_list', [])
             if models:
-                st.markdown(f"**🗂️ Models:** {', '.join(models[:10])}")
-            
+                parts.append(f"**🗂️ Models:** {', '.join(models[:10])}")
+            if parts:
+                st.markdown("\n\n".join(parts))
             
             # All Dependencies
             all_deps = analysis.get('dependencies', [])
             if all_deps:
                 st.markdown(f"**📦 All Dependencies ({len(all_deps)}):**")
-                deps_text = ', '.join(all_deps)
-                st.text_area("Dependencies", deps_text, height=100, disabled=True)
+                # Only the first DEPENDENCIES_SHOWN are drawn; the full list is a download.
+                deps_text = '\n'.join(all_deps[:DEPENDENCIES_SHOWN])
+                if len(all_deps) > DEPENDENCIES_SHOWN:
+                    deps_text += f"\n... (+{len(all_deps) - DEPENDENCIES_SHOWN} more, download the full list)"
+                    st.download_button(
+                        "⬇️ Download all dependencies",
+                        '\n'.join(all_deps),
+                        file_name=f"project_{pid}_dependencies.txt",
+                        mime="text/plain",
+                        key=f"download_deps_{pid}",
+                    )
+                st.code(deps_text, language=None)
         
-        if st.button("❌ Close Analysis", key=f"close_analysis_{project['id']}"):
-            st.session_state[f'show_analysis_{project["id"]}'] = False
-            st.rerun()
+        if st.button("❌ Close Analysis", key=f"close_analysis_{pid}"):
+            _project_ui(pid)['analysis'] = False
+            st.rerun(scope="fragment")
 
 
-def render_source_info(project):
+def render_source_info(project: ProjectView):
     """Render source information section"""
     st.markdown("### 📁 Source Information")
-    source_type = project.get('source_type', 'Unknown').upper()
-    source_value = project.get('source_value', 'N/A')
+    source_type = project.source_type.upper()
+    source_value = project.source_value
     
-    if source_type == 'ZIP':
-        st.write(f"**Source:** 📦 ZIP File - `{source_value}`")
-    elif source_type == 'GITHUB':
-        st.write(f"**Source:** 🐙 GitHub - [{source_value}]({source_value})")
+    fmt = _SOURCE_FORMATS.get(source_type)
+    if fmt:
+        st.write(fmt.format(value=source_value))
     else:
         st.write(f"**Source:** {source_type} - {source_value}")
     
-    st.write(f"**Personas:** {', '.join(project.get('personas', []))}")
+    st.write(f"**Personas:** {', '.join(project.personas)}")
 
 
-def render_delete_section(project):
+def render_delete_section(project: ProjectView):
     """Render delete button and confirmation"""
+    pid = project.id
+    title = project.title
+    ui = _project_ui(pid)
     st.divider()
     col1, col2 = st.columns([3, 1])
     with col2:
-        if st.button(f"🗑️ Delete", key=f"delete_project_{project['id']}", type="secondary"):
-            st.session_state[f'confirm_delete_{project["id"]}'] = True
+        if st.button(f"🗑️ Delete", key=f"delete_project_{pid}", type="secondary"):
+            ui['confirm_delete'] = True
             st.rerun()
     
     # Show confirmation dialog
-    if st.session_state.get(f'confirm_delete_{project["id"]}', False):
-        st.warning(f"⚠️ Are you sure you want to delete **{project['title']}**?")
-        st.write("This will permanently delete:")
-        st.write("- All project files")
-        st.write("- All chat sessions and messages")
+    if ui.get('confirm_delete', False):
+        st.warning(
+            f"⚠️ Are you sure you want to delete **{title}**?\n\n"
+            "This will permanently delete:\n"
+            "- All project files\n"
+            "- All chat sessions and messages"
+        )
         
         confirm_col1, confirm_col2, confirm_col3 = st.columns([1, 1, 2])
         with confirm_col1:
-            if st.button("✓ Yes, Delete", key=f"confirm_yes_{project['id']}", type="primary"):
-                if delete_project(project['id']):
-                    st.success(f"Project '{project['title']}' deleted successfully!")
-                    st.session_state.pop(f'confirm_delete_{project["id"]}', None)
-                    time.sleep(1)
+            if st.button("✓ Yes, Delete", key=f"confirm_yes_{pid}", type="primary"):
+                if delete_project(pid):
+                    # A toast survives the rerun, so there is no need to hold the
+                    # script thread while a success message stays on screen.
+                    st.toast(f"Project '{title}' deleted successfully!", icon="✅")
+                    st.session_state['project_ui'].pop(pid, None)
                     st.rerun()
         with confirm_col2:
-            if st.button("✗ Cancel", key=f"confirm_no_{project['id']}"):
-                st.session_state.pop(f'confirm_delete_{project["id"]}', None)
+            if st.button("✗ Cancel", key=f"confirm_no_{pid}"):
+                ui.pop('confirm_delete', None)
                 st.rerun()
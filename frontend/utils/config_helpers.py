@@ -0,0 +1,38 @@
+"""
+Helpers shared by the pages that display analysis configurations.
+"""
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# (config flag, label) for each optional agent, in display order.
+_AGENT_FIELDS = (
+    ("enable_file_structure_agent", "FileStructure"),
+    ("enable_api_agent", "API"),
+    ("enable_web_augmented", "Web"),
+    ("enable_sde_agent", "SDE"),
+    ("enable_pm_agent", "PM"),
+)
+
+
+@lru_cache(maxsize=256)
+def _summary(name: str, is_default: bool, depth, verbosity, persona, flags: Tuple[bool, ...]) -> Tuple[str, str, str]:
+    title = f"{'⭐ ' if is_default else ''}{name}"
+    settings = f"Depth: {depth} | Verbosity: {verbosity} | Persona: {persona}"
+    agents = "Agents: " + (", ".join(label for flag, (_, label) in zip(flags, _AGENT_FIELDS) if flag) or "None")
+    return title, settings, agents
+
+
+def config_summary(cfg: Dict) -> Tuple[str, str, str]:
+    """
+    Display strings for a configuration: (title, settings caption, agents caption).
+
+    Memoized on the displayed fields, so reruns reuse the strings for unchanged configs.
+    """
+    return _summary(
+        cfg.get("name", "Untitled"),
+        bool(cfg.get("is_default")),
+        cfg.get("analysis_depth"),
+        cfg.get("doc_verbosity"),
+        cfg.get("persona_mode"),
+        tuple(bool(cfg.get(key)) for key, _ in _AGENT_FIELDS),
+    )